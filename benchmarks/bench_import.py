@@ -0,0 +1,28 @@
+"""
+Measures the time to import flowstep in a fresh interpreter.
+
+Usage: python -m benchmarks.bench_import [repeat]
+"""
+
+import subprocess
+import sys
+from time import perf_counter
+
+
+def import_time(module: str) -> float:
+    began = perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return perf_counter() - began
+
+
+def main(repeat: int = 10):
+    print(f"Import time in a fresh interpreter (best of {repeat})")
+
+    # The interpreter and loguru alone are the floor for importing flowstep
+    for module in ("sys", "loguru", "flowstep"):
+        elapsed = min(import_time(module) for _ in range(repeat))
+        print(f"{module:>10}: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,58 @@
+"""
+Compares Flow iteration and construction overhead with plain `enumerate`.
+
+Usage: python -m benchmarks.bench_iteration [n_items]
+"""
+
+import sys
+from timeit import timeit
+
+from flowstep import Flow
+
+
+def enumerate_list(data: list):
+    for index, item in enumerate(data):
+        pass
+
+
+def flow_list(data: list):
+    for index, item in Flow(data):
+        pass
+
+
+def flow_generator(data: list):
+    for index, item in Flow(item for item in data):
+        pass
+
+
+def enumerate_generator(data: list):
+    for index, item in enumerate(item for item in data):
+        pass
+
+
+def construct_flows(data: list):
+    for _ in range(len(data) // 100):
+        Flow(data[:10])
+
+
+def main(n_items: int = 1_000_000, repeat: int = 3):
+    data = list(range(n_items))
+    print(f"Iteration over {n_items} items (best of {repeat})")
+
+    baselines = {}
+    for bench, baseline in (
+        (enumerate_list, None),
+        (flow_list, enumerate_list),
+        (enumerate_generator, None),
+        (flow_generator, enumerate_generator),
+        (construct_flows, None),
+    ):
+        elapsed = min(timeit(lambda: bench(data), number=1) for _ in range(repeat))
+        baselines[bench] = elapsed
+
+        ratio = f" ({elapsed / baselines[baseline]:.1f}x)" if baseline else ""
+        print(f"{bench.__name__:>20}: {elapsed:.3f}s{ratio}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
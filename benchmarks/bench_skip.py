@@ -0,0 +1,45 @@
+"""
+Measures the per-item overhead of skip-heavy workloads.
+
+Usage: python -m benchmarks.bench_skip [n_items]
+"""
+
+import sys
+from timeit import timeit
+
+from flowstep import Flow
+
+
+def skip_most(item: int) -> bool:
+    # Rejects 99% of the items
+    return item % 100 != 0
+
+
+def baseline(n_items: int):
+    for index, item in enumerate(range(n_items)):
+        if skip_most(item):
+            continue
+
+
+def flow_skip(n_items: int):
+    for index, item in Flow(range(n_items), skip_condition=skip_most):
+        pass
+
+
+def flow_long_run(n_items: int):
+    # A single run of consecutive skips, deeper than the recursion limit
+    for index, item in Flow(range(n_items), skip_condition=lambda item: True):
+        pass
+
+
+def main(n_items: int = 1_000_000, repeat: int = 3):
+    print(f"Skip-heavy workloads over {n_items} items (best of {repeat})")
+
+    for bench in (baseline, flow_skip, flow_long_run):
+        elapsed = min(timeit(lambda: bench(n_items), number=1) for _ in range(repeat))
+        per_item = elapsed / n_items * 1e9
+        print(f"{bench.__name__:>15}: {elapsed:.3f}s ({per_item:.1f} ns/item)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
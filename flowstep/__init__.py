@@ -1,3 +1,5 @@
 from .flow import Flow
+from .asyncflow import AsyncFlow
+from .logging_ import configure_logging
 
-__all__ = ["Flow"]
+__all__ = ["Flow", "AsyncFlow", "configure_logging"]
@@ -0,0 +1,408 @@
+import math
+from hashlib import blake2b
+from random import getrandbits
+from typing import Callable, Dict, Iterable, List, Sequence
+
+MASK_64 = (1 << 64) - 1
+
+DEFAULT_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+# Attributes of Aggregates holding each optional sketch
+SKETCHES = ('stats', 'quantiles', 'distinct')
+
+
+def _mix64(value: int) -> int:
+    # splitmix64 finalizer, spreading integers over the 64-bit range
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def _mix64_array(values):
+    import numpy as np
+
+    values = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def stable_hash(value: object) -> int:
+    """
+    Hashes a value to 64 bits, identically across processes unlike `hash`.
+    """
+    if isinstance(value, int):
+        return _mix64(value & MASK_64)
+
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, (bytes, bytearray, memoryview)):
+        value = repr(value).encode()
+
+    return int.from_bytes(blake2b(value, digest_size=8).digest(), 'little')
+
+
+class RunningStats:
+    """
+    Count, sum, mean, variance, min and max in a single pass.
+
+    Items update the moments with Welford's algorithm, batches and merged stats
+    with the pairwise formula of Chan et al. NumPy batches are reduced vectorized.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self._m2 = 0.0
+
+    @property
+    def variance(self) -> float:
+        """
+        Population variance, NaN when empty.
+        """
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, value):
+        self.count += 1
+        self.sum += value
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def update_batch(self, values: Sequence):
+        if hasattr(values, "dtype"):
+            if not values.size:
+                return
+            mean = float(values.mean())
+            m2 = float(((values - mean) ** 2).sum())
+            self._combine(
+                values.size,
+                values.sum().item(),
+                mean,
+                m2,
+                values.min().item(),
+                values.max().item(),
+            )
+            return
+
+        values = values if isinstance(values, list) else list(values)
+        if not values:
+            return
+
+        total = sum(values)
+        mean = total / len(values)
+        m2 = sum((value - mean) ** 2 for value in values)
+        self._combine(len(values), total, mean, m2, min(values), max(values))
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        if other.count:
+            self._combine(
+                other.count, other.sum, other.mean, other._m2, other.min, other.max
+            )
+
+        return self
+
+    def _combine(self, count: int, total, mean: float, m2: float, low, high):
+        combined = self.count + count
+        delta = mean - self.mean
+
+        self._m2 += m2 + delta * delta * self.count * count / combined
+        self.mean += delta * count / combined
+        self.count = combined
+        self.sum += total
+
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean if self.count else math.nan,
+            "variance": self.variance,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class QuantileSketch:
+    """
+    KLL sketch estimating quantiles in memory logarithmic in the number of items.
+
+    Items enter the bottom compactor. Full compactors are sorted and half of their
+    items, every other one from a random offset, are promoted with twice the
+    weight. Sketches with the same `k` merge by concatenating their compactors.
+
+    Args:
+        k: Capacity of the top compactor, trading memory for accuracy.
+    """
+
+    def __init__(self, k: int = 200):
+        if k < 8:
+            raise ValueError("Sketch capacity must be at least 8.")
+
+        self.k = k
+        self.count = 0
+        self._levels: List[list] = [[]]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def _size(self) -> int:
+        return sum(len(level) for level in self._levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def update(self, value):
+        self._levels[0].append(value)
+        self.count += 1
+
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update_batch(self, values: Iterable):
+        values = values.tolist() if hasattr(values, "tolist") else list(values)
+
+        self._levels[0].extend(values)
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same capacity can be merged.")
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in zip(self._levels, other._levels):
+            level.extend(items)
+
+        self.count += other.count
+        self._compress()
+
+        return self
+
+    def _compress(self):
+        while self._size() > self._max_size():
+            for height, level in enumerate(self._levels):
+                if len(level) < self._capacity(height):
+                    continue
+
+                if height + 1 == len(self._levels):
+                    self._levels.append([])
+
+                level.sort()
+                kept = level.pop() if len(level) % 2 else None
+                self._levels[height + 1].extend(level[getrandbits(1) :: 2])
+                level[:] = [] if kept is None else [kept]
+                break
+
+    def quantile(self, q: float):
+        """
+        Returns the approximate `q` quantile, None when empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantiles must be in the [0, 1] interval.")
+
+        weighted = sorted(
+            (value, 1 << height)
+            for height, level in enumerate(self._levels)
+            for value in level
+        )
+        if not weighted:
+            return None
+
+        target = q * sum(weight for _, weight in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+
+        return weighted[-1][0]
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct items with `2 ** precision` one-byte registers.
+
+    The relative error is about `1.04 / sqrt(2 ** precision)`. Items are hashed
+    with `stable_hash`, so sketches built in other processes can be merged.
+    NumPy and pandas integer batches are hashed and registered vectorized.
+
+    Args:
+        precision: Number of hash bits selecting a register, between 4 and 18.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError("Precision must be between 4 and 18.")
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def _add_hash(self, value: int):
+        bits = 64 - self.precision
+        register = value >> bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+
+        if rank > self._registers[register]:
+            self._registers[register] = rank
+
+    def update(self, value):
+        self._add_hash(stable_hash(value))
+
+    def update_batch(self, values: Iterable):
+        if hasattr(values, "dtype") and values.dtype.kind in "iu":
+            import numpy as np
+
+            # pandas objects have no ravel
+            self._update_array(np.asarray(values).ravel())
+            return
+
+        values = values.tolist() if hasattr(values, "tolist") else values
+        for value in values:
+            self._add_hash(stable_hash(value))
+
+    def _update_array(self, values):
+        import numpy as np
+
+        bits = 64 - self.precision
+        hashes = _mix64_array(values)
+        registers = (hashes >> np.uint64(bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << bits) - 1)
+
+        # Bit lengths from 32-bit halves, exactly representable as floats
+        high = np.frexp((remainder >> np.uint64(32)).astype(np.float64))[1]
+        low = np.frexp((remainder & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+        lengths = np.where(high > 0, high + 32, low)
+
+        ranks = (bits - lengths + 1).astype(np.uint8)
+        np.maximum.at(np.frombuffer(self._registers, dtype=np.uint8), registers, ranks)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+        return self
+
+    def count(self) -> float:
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-rank for rank in self._registers)
+
+        # Linear counting is more accurate for small cardinalities
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+
+        return estimate
+
+
+class Aggregates:
+    """
+    Running aggregates over the items of a flow, updated in batches.
+
+    Items are buffered and handed to each aggregate every `buffer_size` items, so
+    iterating costs one list append per item. Every aggregate is mergeable, which
+    lets parallel or sharded runs combine their results.
+
+    Args:
+        key: Optional function extracting the aggregated value of an item.
+        stats: Whether to compute count, sum, mean, variance, min and max.
+        quantiles: Whether to estimate quantiles.
+        distinct: Whether to estimate the number of distinct values.
+        buffer_size: Number of items buffered between two updates.
+        k: Capacity of the quantile sketch.
+        precision: Precision of the distinct count sketch.
+    """
+
+    def __init__(
+        self,
+        key: Callable = None,
+        stats: bool = True,
+        quantiles: bool = True,
+        distinct: bool = True,
+        buffer_size: int = 1024,
+        k: int = 200,
+        precision: int = 12,
+    ):
+        self.key = key
+        self.buffer_size = buffer_size
+
+        self.stats = RunningStats() if stats else None
+        self.quantiles = QuantileSketch(k) if quantiles else None
+        self.distinct = HyperLogLog(precision) if distinct else None
+
+        self._buffer: list = []
+
+    def _sketches(self) -> list:
+        return [
+            sketch
+            for sketch in (self.stats, self.quantiles, self.distinct)
+            if sketch is not None
+        ]
+
+    def add(self, item: object):
+        self._buffer.append(item)
+
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def update_batch(self, items: Sequence):
+        """
+        Aggregates a batch at once, vectorized for NumPy arrays without a key.
+        """
+        self.flush()
+
+        if self.key is not None:
+            items = [self.key(item) for item in items]
+
+        for sketch in self._sketches():
+            sketch.update_batch(items)
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        items, self._buffer = self._buffer, []
+        self.update_batch(items)
+
+    def merge(self, other: 'Aggregates') -> 'Aggregates':
+        names = [name for name in SKETCHES if getattr(self, name) is not None]
+        if names != [name for name in SKETCHES if getattr(other, name) is not None]:
+            raise ValueError("Only aggregates with the same sketches can be merged.")
+
+        self.flush()
+        other.flush()
+
+        for name in names:
+            getattr(self, name).merge(getattr(other, name))
+
+        return self
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        self.flush()
+
+        summary = {} if self.stats is None else self.stats.summary()
+        if self.quantiles is not None:
+            summary["quantiles"] = {q: self.quantiles.quantile(q) for q in quantiles}
+        if self.distinct is not None:
+            summary["distinct"] = self.distinct.count()
+
+        return summary
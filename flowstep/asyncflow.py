@@ -0,0 +1,238 @@
+import asyncio
+from inspect import isawaitable
+from typing import AsyncIterator, Callable, Dict, Iterable, Union
+
+from .defaults import (
+    default_skip_condition,
+    ActionMessages,
+)
+from .logging_ import logger
+from .utils import length_hint
+
+# Type alias for readability, conditions may be plain or coroutine functions
+AsyncCondition = Callable[[object], object]
+
+# Marks the end of a prefetched flow
+_EXHAUSTED = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def _aiterate(iterable: Iterable):
+    for item in iterable:
+        yield item
+
+
+class AsyncFlow:
+    """
+    Provides flow control functionalities for async iterables.
+
+    Pausing never blocks the event loop: consumers wait on an `asyncio.Event`
+    until `resume`, `skip` or `stop` is called, typically from another task.
+
+    Args:
+        iterable: The async (or plain) iterable to iterate over.
+        total: Optional number of items, taken from the iterable when possible.
+        skip_condition: Optional function or coroutine function that takes the
+            current item and returns True to skip.
+        verbose: Whether to log pause, resume, skip and stop messages.
+        prefetch: Number of items read ahead by a background task, shared by all
+            concurrent consumers. Zero reads items on demand.
+    """
+
+    def __init__(
+        self,
+        iterable: Union[AsyncIterator, Iterable],
+        total: int = None,
+        skip_condition: AsyncCondition = default_skip_condition,
+        verbose: bool = False,
+        prefetch: int = 0,
+    ):
+        if hasattr(iterable, "__aiter__"):
+            self.total = total
+            self.iterator = iterable.__aiter__()
+        else:
+            self.total = length_hint(iterable) if total is None else total
+            self.iterator = _aiterate(iterable)
+
+        self.paused: bool = False
+        self.skipped: bool = False
+        self.stopped: bool = False
+
+        self._messages: Dict = ActionMessages()
+
+        self._counter: int = 0
+        self._skip_condition = skip_condition
+        self.verbose = verbose
+
+        # Created in the running loop, older Pythons bind them to a loop on creation
+        self.__running: asyncio.Event = None
+        self.__lock: asyncio.Lock = None
+
+        self.prefetch = prefetch
+        self._queue: asyncio.Queue = None
+        self._producer: asyncio.Task = None
+
+    def __aiter__(self):
+        return self
+
+    @property
+    def _running(self) -> asyncio.Event:
+        # Set while running, cleared while paused
+        if self.__running is None:
+            self.__running = asyncio.Event()
+            if not self.paused:
+                self.__running.set()
+
+        return self.__running
+
+    @property
+    def _lock(self) -> asyncio.Lock:
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+
+        return self.__lock
+
+    def __set_running(self, running: bool):
+        if self.__running is None:
+            return
+
+        if running:
+            self.__running.set()
+        else:
+            self.__running.clear()
+
+    def pause(self, message=None):
+        self.paused = True
+        self.__set_running(False)
+        self._messages["pause"] = message if message else ('Paused', self._counter)
+
+        self.__print_message('pause')
+
+    def resume(self, message=None):
+        self.paused = False
+        self.__set_running(True)
+        self._messages["resume"] = message if message else ('Resumed', self._counter)
+
+        self.__print_message('resume')
+
+    def skip(self, message=None):
+        # Skipping while paused skips the next item and resumes
+        self.skipped = True
+        self.paused = False
+        self.__set_running(True)
+        self._messages["skip"] = message if message else ('Skipped', self._counter)
+
+        self.__print_message('skip')
+
+    def stop(self, message=None):
+        self.stopped = True
+        self.paused = False
+        self.__set_running(True)
+        self._messages["stop"] = message if message else ('Stopped', self._counter)
+
+        self.__print_message('stop')
+
+    def __print_message(self, action: str):
+        # Messages are neither formatted nor logged unless verbose
+        if not self.verbose:
+            return
+
+        message = self._messages[action]
+        if message:
+            logger.info(message)
+
+    async def wait_resumed(self, timeout: float = None) -> bool:
+        """
+        Waits until the flow is no longer paused.
+
+        Returns:
+            False if the timeout expired while still paused, True otherwise.
+        """
+        try:
+            await asyncio.wait_for(self._running.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    async def _read(self):
+        # Serialize reads so concurrent consumers get consistent counters
+        async with self._lock:
+            while True:
+                if self.stopped:
+                    raise StopAsyncIteration
+
+                await self._running.wait()
+
+                if self.stopped:
+                    raise StopAsyncIteration
+
+                try:
+                    item = await self.iterator.__anext__()
+                except StopAsyncIteration:
+                    if self.total is None:
+                        self.total = self._counter
+                    raise
+
+                counter = self._counter
+                self._counter += 1
+
+                skip = self._skip_condition(item)
+                if isawaitable(skip):
+                    skip = await skip
+
+                if skip or self.skipped:
+                    self.skipped = False
+                    continue
+
+                return (counter, item)
+
+    async def _produce(self):
+        try:
+            while True:
+                await self._queue.put(await self._read())
+        except StopAsyncIteration:
+            await self._queue.put(_EXHAUSTED)
+        except Exception as error:
+            # Raised to the consumer next in line, the others then stop
+            await self._queue.put(_Failure(error))
+
+    async def __anext__(self):
+        if self.prefetch <= 0:
+            return await self._read()
+
+        if self._producer is None:
+            self._queue = asyncio.Queue(maxsize=self.prefetch)
+            self._producer = asyncio.ensure_future(self._produce())
+
+        if self.stopped:
+            raise StopAsyncIteration
+
+        pair = await self._queue.get()
+        if pair is _EXHAUSTED:
+            # Leave the marker for the other consumers
+            self._queue.put_nowait(pair)
+            raise StopAsyncIteration
+        if isinstance(pair, _Failure):
+            self._queue.put_nowait(_EXHAUSTED)
+            raise pair.error
+
+        return pair
+
+    async def aclose(self):
+        if self._producer is not None and not self._producer.done():
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -0,0 +1,225 @@
+from collections import deque
+from itertools import compress, islice
+from operator import not_
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .utils import sliceable_view
+
+# Type alias for readability
+BatchCondition = Callable[[Sequence], Sequence[bool]]
+
+
+class MaskedChunks:
+    """
+    Iterates over the items surviving a vectorized skip condition.
+
+    The iterable is read in chunks, the condition is called once per chunk and
+    returns a boolean mask (True to skip). Slices are taken directly from
+    index-addressable sources, so NumPy arrays are evaluated on zero-copy views.
+
+    Args:
+        iterable: The iterable to iterate over.
+        batch_skip_condition: Function that takes a chunk and returns a boolean mask.
+        batch_size: Maximum number of items per chunk.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable,
+        batch_skip_condition: BatchCondition,
+        batch_size: int,
+    ):
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self._view = sliceable_view(iterable)
+        self._iterator = iter(iterable) if self._view is None else None
+        self._condition = batch_skip_condition
+        self._batch_size = batch_size
+
+        self._pending: deque = deque()
+        self._start: int = 0
+        self._exhausted: bool = False
+
+        # Position right after the last yielded item, in original indices
+        self.position: int = 0
+
+    def __iter__(self):
+        return self
+
+    def _read_chunk(self):
+        start = self._start
+
+        if self._view is None:
+            chunk = list(islice(self._iterator, self._batch_size))
+        else:
+            chunk = self._view[start : start + self._batch_size]
+
+        size = len(chunk)
+        self._start += size
+
+        return start, chunk, size
+
+    def _fill(self):
+        while not self._pending and not self._exhausted:
+            start, chunk, size = self._read_chunk()
+
+            if size < self._batch_size:
+                self._exhausted = True
+            if size == 0:
+                break
+
+            mask = self._condition(chunk)
+            view = getattr(chunk, "iloc", chunk)
+            self._pending.extend(
+                (start + offset, view[offset])
+                for offset in compress(range(size), map(not_, mask))
+            )
+
+    def seek(self, position: int):
+        """
+        Moves to an original index. Iterator-backed chunks can only move forward.
+        """
+        if self._view is not None:
+            self._pending.clear()
+            self._start = position
+            self._exhausted = False
+
+        elif position < self.position:
+            raise ValueError("Cannot seek backwards on a non-sliceable iterable.")
+
+        else:
+            # Already evaluated items past the position are kept
+            while self._pending and self._pending[0][0] < position:
+                self._pending.popleft()
+
+            if position > self._start:
+                skipped = sum(1 for _ in islice(self._iterator, position - self._start))
+                self._start += skipped
+                if self._start < position:
+                    self._exhausted = True
+
+        self.position = position
+
+    def __next__(self):
+        if not self._pending:
+            self._fill()
+
+        if not self._pending:
+            self.position = self._start
+            raise StopIteration
+
+        index, item = self._pending.popleft()
+        self.position = index + 1
+
+        return item
+
+
+BATCH_KINDS = ['list', 'tuple', 'view']
+
+
+def buffer_view(obj: object) -> Optional[memoryview]:
+    """
+    Returns a memoryview over objects exposing the buffer protocol, if any.
+
+    NumPy arrays and pandas objects are left to their own (zero-copy) slicing.
+    """
+    if hasattr(obj, "dtype") or hasattr(obj, "iloc"):
+        return None
+
+    try:
+        return memoryview(obj)
+    except TypeError:
+        return None
+
+
+class AdaptiveBatchSizer:
+    """
+    Resizes batches so that consumers spend about `target_latency` seconds on each.
+
+    The size is scaled by the ratio between the target and the measured latency,
+    limited to halving or doubling at each step to damp noisy measurements.
+
+    Args:
+        size: Initial batch size.
+        target_latency: Target number of seconds spent per batch.
+        max_size: Upper bound for the batch size.
+    """
+
+    def __init__(self, size: int, target_latency: float, max_size: int):
+        if target_latency <= 0:
+            raise ValueError("Target latency must be positive.")
+
+        self.size = max(1, min(size, max_size))
+        self.target_latency = target_latency
+        self.max_size = max_size
+
+    def update(self, latency: float) -> int:
+        ratio = 2.0 if latency <= 0 else self.target_latency / latency
+        ratio = min(max(ratio, 0.5), 2.0)
+
+        self.size = max(1, min(int(self.size * ratio), self.max_size))
+
+        return self.size
+
+
+def iter_batches(
+    flow,
+    size: int,
+    kind: str,
+    target_latency: Optional[float],
+    max_size: int,
+) -> Iterator[Tuple[int, object]]:
+    """
+    Yields `(start, batch)` pairs, checking the flow control flags once per batch.
+
+    Skipping drops the next whole batch. Count-based pauses happen before the
+    batch following the first boundary crossed. When `target_latency` is given,
+    the time the consumer spends on each batch drives the size of the next one.
+    """
+    if size < 1:
+        raise ValueError("Batch size must be a positive integer.")
+    if kind not in BATCH_KINDS:
+        raise ValueError(f"Batch kind {kind} not supported")
+
+    sizer = (
+        AdaptiveBatchSizer(size, target_latency, max_size)
+        if target_latency is not None
+        else None
+    )
+
+    while True:
+        if flow.stopped:
+            return
+
+        if flow._counter >= flow._pause_at:
+            every = flow._pause_every
+            flow._pause_at = (flow._counter // every + 1) * every
+            flow.pause()
+
+        while flow.paused:
+            flow._controller.handle(flow)
+
+        if flow.stopped:
+            return
+
+        start, batch, count = flow._read_batch(
+            size if sizer is None else sizer.size, kind
+        )
+        if count == 0:
+            return
+
+        # Batches emptied by the skip condition are not yielded
+        if not len(batch):
+            continue
+
+        if flow.skipped:
+            flow.skipped = False
+            continue
+
+        began = perf_counter()
+        yield start, batch
+
+        if sizer is not None:
+            sizer.update(perf_counter() - began)
@@ -0,0 +1,186 @@
+from collections import deque
+from threading import Condition, Thread, current_thread
+from time import monotonic
+from typing import Callable, List, Optional
+
+from .flow import Flow
+
+DEFAULT_BUFFER_SIZE = 1024
+
+# Seconds a read waits for a thread to start reading a full branch
+DEFAULT_READER_TIMEOUT = 1.0
+
+
+class Router:
+    """
+    Reads a flow once and routes each item to the branches accepting it.
+
+    Branches pull items: a branch with an empty buffer reads the next item from
+    the source and appends it, by reference, to the buffer of every open branch
+    whose predicate accepts it. Items no branch accepts are dropped. Reading
+    waits while any open buffer holds `size` items, so the slowest branch
+    throttles the source. Branches consumed unevenly from a single thread must
+    therefore stay within `size` items of each other. A read waiting on full
+    buffers that no other live thread reads raises a RuntimeError, once
+    `reader_timeout` seconds have passed without a thread starting to read
+    them.
+
+    Args:
+        source: The flow to read.
+        predicates: One predicate per branch, None accepting every item.
+        size: Capacity of each branch buffer.
+        reader_timeout: Seconds a read waits for a thread to start reading a
+            full branch no thread has read yet.
+    """
+
+    def __init__(
+        self,
+        source: Flow,
+        predicates: List[Optional[Callable]],
+        size: int,
+        reader_timeout: float = DEFAULT_READER_TIMEOUT,
+    ):
+        if size < 1:
+            raise ValueError("Branch buffer size must be a positive integer.")
+        if reader_timeout < 0:
+            raise ValueError("Reader timeout must be a non-negative number.")
+
+        self.source = source
+        self.predicates = predicates
+        self.size = size
+        self.reader_timeout = reader_timeout
+
+        self._buffers = [deque() for _ in predicates]
+        self._closed = [False] * len(predicates)
+        # Thread that last pulled each branch, None until the branch is first pulled
+        self._readers: List[Optional[Thread]] = [None] * len(predicates)
+        self._condition = Condition()
+        self._reading = False
+        self._exhausted = False
+
+    def _full(self) -> List[int]:
+        return [
+            branch
+            for branch, (buffer, closed) in enumerate(zip(self._buffers, self._closed))
+            if not closed and len(buffer) >= self.size
+        ]
+
+    def _drained(self, branch: int) -> bool:
+        reader = self._readers[branch]
+        if reader is None or reader is current_thread():
+            return False
+
+        return reader.is_alive()
+
+    def next(self, branch: int) -> object:
+        deadline = None
+        while True:
+            with self._condition:
+                self._readers[branch] = current_thread()
+                buffer = self._buffers[branch]
+                if buffer:
+                    item = buffer.popleft()
+                    self._condition.notify_all()
+                    return item
+
+                if self._exhausted or self._closed[branch]:
+                    raise StopIteration
+
+                if self._reading:
+                    self._condition.wait()
+                    continue
+
+                full = self._full()
+                if full and any(self._drained(target) for target in full):
+                    self._condition.wait()
+                    continue
+
+                # Branches no thread pulled yet get a grace period to be picked up
+                if full and any(self._readers[target] is None for target in full):
+                    if deadline is None:
+                        deadline = monotonic() + self.reader_timeout
+                    if monotonic() < deadline:
+                        self._condition.wait(deadline - monotonic())
+                        continue
+
+                if full:
+                    raise RuntimeError(
+                        f"Branch {branch} cannot read further while branch "
+                        f"{full[0]} is full and no other thread reads it, consume "
+                        "branches from separate threads or increase the buffer size."
+                    )
+
+                # Only one branch reads at a time, the others keep draining
+                self._reading = True
+
+            targets = []
+            try:
+                _, item = next(self.source)
+                targets = [
+                    target
+                    for target, predicate in enumerate(self.predicates)
+                    if not self._closed[target]
+                    and (predicate is None or predicate(item))
+                ]
+            except StopIteration:
+                self._exhausted = True
+            finally:
+                with self._condition:
+                    for target in targets:
+                        self._buffers[target].append(item)
+                    self._reading = False
+                    self._condition.notify_all()
+
+    def close(self, branch: int):
+        """
+        Stops routing items to a branch, dropping its buffered items.
+        """
+        with self._condition:
+            self._closed[branch] = True
+            self._buffers[branch].clear()
+            self._condition.notify_all()
+
+
+class BranchIterator:
+    def __init__(self, router: Router, branch: int):
+        self.router = router
+        self.branch = branch
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.router.next(self.branch)
+
+
+class BranchFlow(Flow):
+    """
+    Flow over the items routed to one branch, with its own pause, skip and stop.
+
+    Pausing a branch lets its buffer fill up, throttling the source and the other
+    branches. Stopping it detaches it from the router, so the others go on.
+    """
+
+    __slots__ = ('router', 'branch')
+
+    def __init__(self, router: Router, branch: int, **kwargs):
+        self.router = router
+        self.branch = branch
+
+        super().__init__(BranchIterator(router, branch), **kwargs)
+
+    def stop(self, message=None):
+        self.router.close(self.branch)
+        super().stop(message)
+
+
+def branch_flows(
+    source: Flow,
+    predicates: List[Optional[Callable]],
+    size: int,
+    reader_timeout: float = DEFAULT_READER_TIMEOUT,
+    **kwargs,
+) -> List[BranchFlow]:
+    router = Router(source, predicates, size, reader_timeout)
+
+    return [BranchFlow(router, branch, **kwargs) for branch in range(len(predicates))]
@@ -0,0 +1,97 @@
+import json
+from time import monotonic
+from typing import Dict, Optional
+
+from .defaults import IMPERATIVE_ACTIONS
+from .utils import atomic_write
+
+CHECKPOINT_VERSION = 1
+
+
+def has_state_hook(source: object) -> bool:
+    """
+    Checks if a source saves and restores its own state through `state()` and
+    `restore_state(state)`, such as the keyset positions of a query.
+    """
+    return callable(getattr(source, "state", None)) and callable(
+        getattr(source, "restore_state", None)
+    )
+
+
+def source_state(flow) -> Optional[Dict]:
+    source = flow.iterator if flow._source is None else flow._source
+    if source is flow._prefetcher:
+        source = flow._prefetcher._source
+
+    return source.state() if has_state_hook(source) else None
+
+
+def flow_state(flow) -> Dict:
+    return {
+        "version": CHECKPOINT_VERSION,
+        "counter": flow._counter,
+        "total": flow.total,
+        "paused": flow.paused,
+        "skipped": flow.skipped,
+        "stopped": flow.stopped,
+        "bookmarks": dict(flow._bookmarks or {}),
+        "messages": {action: flow._messages[action] for action in IMPERATIVE_ACTIONS},
+        "source": source_state(flow),
+    }
+
+
+def save_checkpoint(state: Dict, path: str):
+    """
+    Writes a checkpoint atomically: readers see either the previous or the new one.
+    """
+    atomic_write(path, json.dumps(state, separators=(',', ':')))
+
+
+def load_checkpoint(path: str) -> Dict:
+    with open(path) as file:
+        state = json.load(file)
+
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint version {state.get('version')} not supported")
+
+    return state
+
+
+class Autosave:
+    """
+    Saves a flow checkpoint every `every` items and/or every `interval` seconds.
+
+    Args:
+        path: Path of the checkpoint file.
+        every: Optional number of items between two checkpoints.
+        interval: Optional number of seconds between two checkpoints.
+    """
+
+    def __init__(self, path: str, every: int = None, interval: float = None):
+        if every is None and interval is None:
+            raise ValueError("Autosave requires a number of items or an interval.")
+        if every is not None and every < 1:
+            raise ValueError("Autosave item count must be a positive integer.")
+
+        self.path = path
+        self.every = every
+        self.interval = interval
+
+        self._next_count = every
+        self._next_time = None if interval is None else monotonic() + interval
+
+    def tick(self, flow):
+        due = self._next_count is not None and flow._counter >= self._next_count
+        if not due and self._next_time is not None:
+            due = monotonic() >= self._next_time
+
+        if due:
+            self.save(flow)
+
+    def save(self, flow):
+        save_checkpoint(flow_state(flow), self.path)
+
+        if self.every is not None:
+            self._next_count = flow._counter + self.every
+        if self.interval is not None:
+            self._next_time = monotonic() + self.interval
@@ -0,0 +1,98 @@
+import heapq
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from .flow import Flow
+
+# Items of combined flows are tagged with their origin
+SourcedItem = Tuple[int, int, object]
+
+
+def as_flow(iterable: Iterable) -> Flow:
+    return iterable if isinstance(iterable, Flow) else Flow(iterable)
+
+
+def merge_sorted(children: List[Flow], key: Callable = None) -> Iterator[SourcedItem]:
+    """
+    Heap-based k-way merge of sorted flows, in O(log k) per item.
+
+    Ties are broken by source position, keeping the merge stable.
+    """
+    key = (lambda item: item) if key is None else key
+    heap = []
+
+    def push(source: int):
+        for index, item in children[source]:
+            heapq.heappush(heap, (key(item), source, index, item))
+            return
+
+    for source in range(len(children)):
+        push(source)
+
+    while heap:
+        _, source, index, item = heapq.heappop(heap)
+        yield source, index, item
+        push(source)
+
+
+def interleave_flows(children: List[Flow]) -> Iterator[SourcedItem]:
+    """
+    Round-robin over the flows until all of them are exhausted.
+    """
+    active = list(range(len(children)))
+
+    while active:
+        for source in list(active):
+            try:
+                index, item = next(children[source])
+            except StopIteration:
+                active.remove(source)
+                continue
+
+            yield source, index, item
+
+
+def chain_flows(children: List[Flow]) -> Iterator[SourcedItem]:
+    for source, child in enumerate(children):
+        for index, item in child:
+            yield source, index, item
+
+
+class CombinedFlow(Flow):
+    """
+    Flow over several child flows, yielding `(source, index, item)` triples.
+
+    `source` is the position of the child the item came from and `index` its
+    index within that child. Pause, resume and stop are forwarded to every child;
+    skip drops the next combined item.
+
+    Args:
+        children: The child flows.
+        items: Iterator of sourced items built from the children.
+        **kwargs: Further arguments given to the flow.
+    """
+
+    __slots__ = ('children',)
+
+    def __init__(self, children: List[Flow], items: Iterator[SourcedItem], **kwargs):
+        self.children = children
+
+        totals = [child.total for child in children]
+        if 'total' not in kwargs and None not in totals:
+            kwargs['total'] = sum(totals)
+
+        super().__init__(items, **kwargs)
+
+    def pause(self, message=None):
+        super().pause(message)
+        for child in self.children:
+            child.pause()
+
+    def resume(self, message=None):
+        for child in self.children:
+            child.resume()
+        super().resume(message)
+
+    def stop(self, message=None):
+        for child in self.children:
+            child.stop()
+        super().stop(message)
@@ -0,0 +1,77 @@
+from typing import Callable
+
+from .defaults import IMPERATIVE_ACTIONS, Condition, default_skip_condition
+
+# Flags returned by fused conditions
+SKIP = 1
+PAUSE = 2
+
+
+def fuse_conditions(skip_condition: Condition, pause_condition: Condition) -> Callable:
+    """
+    Combines the skip and pause conditions into a single call returning flags.
+
+    The returned function maps an item to `SKIP | PAUSE` bits, so the flow makes
+    one call per item whatever the number of conditions.
+    """
+    if skip_condition is default_skip_condition:
+
+        def fused(item):
+            return PAUSE if pause_condition(item) else 0
+
+    else:
+
+        def fused(item):
+            return (SKIP if skip_condition(item) else 0) | (
+                PAUSE if pause_condition(item) else 0
+            )
+
+    return fused
+
+
+class PauseController:
+    """
+    Decides how a paused flow waits for its next action.
+
+    `Flow.__next__` calls `handle` repeatedly while the flow is paused. Override
+    it to plug in other sources of control, such as a UI or a remote API.
+    """
+
+    def handle(self, flow):
+        raise NotImplementedError
+
+
+class InteractiveController(PauseController):
+    """
+    Prompts the user for the next action (continue, skip or stop).
+    """
+
+    def handle(self, flow):
+        flow._process_pause()
+
+
+class EventController(PauseController):
+    """
+    Sleeps until `resume`, `skip` or `stop` is called, e.g. from another thread.
+
+    The waiting thread uses no CPU. A skip releases the pause and skips the next
+    item.
+
+    Args:
+        timeout: Optional number of seconds to wait for an action.
+        on_timeout: Action taken when the timeout expires ('resume', 'skip' or 'stop').
+    """
+
+    def __init__(self, timeout: float = None, on_timeout: str = 'stop'):
+        if on_timeout not in IMPERATIVE_ACTIONS or on_timeout == 'pause':
+            raise ValueError(f"Timeout action {on_timeout} not supported")
+
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+
+    def handle(self, flow):
+        if not flow.wait_resumed(self.timeout):
+            getattr(flow, self.on_timeout)()
+
+        if flow.skipped and flow.paused:
+            flow.resume()
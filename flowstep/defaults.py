@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Dict
 
 # Type aliases for readability
 Condition = Callable[[object], bool]
@@ -13,6 +13,9 @@ def default_skip_message_callback():
     return ''
 
 
+# Default number of items evaluated at once by batch skip conditions
+DEFAULT_BATCH_SIZE = 2**16
+
 # Default message for pause, resume, and skip actions
 PROMPT_MESSAGE = "Paused for user input (c: continue, s: skip, other: stop): "
 
@@ -27,3 +30,26 @@ def action_default_message(action: str, counter: int):
         raise ValueError(f"Action {action} not supported")
     else:
         return f"{action.capitalize()} at item count {counter + 1}"
+
+
+class ActionMessages(dict):
+    """
+    Messages of the latest pause, resume, skip and stop actions.
+
+    Default messages are stored as `(action, counter)` pairs and only formatted
+    when read, so flows that never log them pay no formatting cost.
+    """
+
+    def __init__(self, messages: Dict = None):
+        super().__init__({action: None for action in IMPERATIVE_ACTIONS})
+        if messages:
+            self.update(messages)
+
+    def __getitem__(self, action: str):
+        message = super().__getitem__(action)
+
+        if isinstance(message, tuple):
+            message = action_default_message(*message)
+            self[action] = message
+
+        return message
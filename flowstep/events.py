@@ -0,0 +1,148 @@
+from queue import Full, Queue
+from threading import Lock, Thread
+from types import MethodType
+from typing import Callable, Dict, List, Union
+from weakref import WeakMethod
+
+from .logging_ import logger
+
+EVENTS = ['pause', 'resume', 'skip', 'stop', 'item']
+
+# Handlers receive the event name, the flow counter and the item or message
+Handler = Callable[[str, int, object], None]
+
+# Stops the delivery thread
+_CLOSE = object()
+
+
+class EventBus:
+    """
+    Dispatches flow events to subscribed handlers.
+
+    Events without subscribers cost nothing: flows only emit events someone
+    subscribed to, and the per-item 'item' event keeps the flow on its fast path
+    until a handler subscribes to it. Handlers are called synchronously by
+    default. With a `queue_size`, events are queued and delivered by a background
+    thread, so slow handlers cannot stall the flow; events arriving while the
+    queue is full are dropped and counted in `dropped`.
+
+    Args:
+        queue_size: Optional size of the queue of an asynchronous delivery.
+    """
+
+    def __init__(self, queue_size: int = None):
+        if queue_size is not None and queue_size < 1:
+            raise ValueError("Event queue size must be a positive integer.")
+
+        self.queue_size = queue_size
+        self.dropped = 0
+
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._watchers: Dict[int, Union[WeakMethod, Callable[[], None]]] = {}
+        self._queue: Queue = None if queue_size is None else Queue(maxsize=queue_size)
+        self._thread: Thread = None
+        self._lock = Lock()
+
+    def watch(self, callback: Callable[[], None]):
+        """
+        Registers a function called whenever subscriptions change.
+
+        Bound methods are held by weak reference, so a bus shared by many flows
+        does not keep them alive, and watchers of collected flows are dropped.
+        """
+        if isinstance(callback, MethodType):
+            callback = WeakMethod(callback, self._unwatch)
+
+        self._watchers[id(callback)] = callback
+
+    def _unwatch(self, reference: WeakMethod):
+        self._watchers.pop(id(reference), None)
+
+    def subscribe(self, event: str, handler: Handler) -> Callable[[], None]:
+        """
+        Subscribes a handler to an event.
+
+        Returns:
+            A function unsubscribing the handler.
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Event {event} not supported")
+
+        # Handler lists are replaced, never mutated, so emitting needs no lock
+        with self._lock:
+            self._handlers[event] = [*self._handlers.get(event, ()), handler]
+        self._notify()
+
+        return lambda: self.unsubscribe(event, handler)
+
+    def unsubscribe(self, event: str, handler: Handler):
+        with self._lock:
+            handlers = [
+                known for known in self._handlers.get(event, ()) if known != handler
+            ]
+            if handlers:
+                self._handlers[event] = handlers
+            else:
+                self._handlers.pop(event, None)
+        self._notify()
+
+    def _notify(self):
+        for watcher in tuple(self._watchers.values()):
+            callback = watcher() if isinstance(watcher, WeakMethod) else watcher
+            if callback is not None:
+                callback()
+
+    def has_subscribers(self, event: str) -> bool:
+        return event in self._handlers
+
+    def emit(self, event: str, counter: int, payload: object = None):
+        handlers = self._handlers.get(event)
+        if not handlers:
+            return
+
+        if self._queue is None:
+            for handler in handlers:
+                handler(event, counter, payload)
+            return
+
+        if self._thread is None:
+            self._start()
+
+        try:
+            self._queue.put_nowait((handlers, event, counter, payload))
+        except Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._deliver, name="flowstep-events", daemon=True
+                )
+                self._thread.start()
+
+    def _deliver(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _CLOSE:
+                return
+
+            handlers, event, counter, payload = entry
+            for handler in handlers:
+                try:
+                    handler(event, counter, payload)
+                except Exception as error:
+                    logger.error(f"Error handling event {event} at {counter}: {error}")
+
+    def close(self):
+        """
+        Delivers the queued events and stops the delivery thread.
+
+        The thread is started again if more events are emitted.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            self._queue.put(_CLOSE)
+            thread.join()
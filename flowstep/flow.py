@@ -1,13 +1,57 @@
-from typing import Iterable, Dict
+import sys
+from threading import Condition as ThreadCondition, Lock, Timer
+from time import perf_counter
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 from .defaults import (
     Condition,
     default_skip_condition,
-    action_default_message,
+    ActionMessages,
     PROMPT_MESSAGE,
     IMPERATIVE_ACTIONS,
+    DEFAULT_BATCH_SIZE,
+)
+from .control import (
+    PAUSE,
+    SKIP,
+    PauseController,
+    InteractiveController,
+    fuse_conditions,
 )
 from .logging_ import logger
+from .utils import has_seek_hook, length_hint, positional_view
+
+# Feature modules are imported where used, so plain flows do not pay for them
+if TYPE_CHECKING:
+    from .aggregates import Aggregates
+    from .batching import BatchCondition
+    from .checkpoint import Autosave
+    from .events import EventBus, Handler
+    from .metrics import FlowMetrics
+    from .progress import Progress
+    from .replay import ReplayBuffer
+    from .retry import DeadLetter
+    from .search import SearchIndex
+    from .sources import ConnectionPool
+
+# Controllers are stateless, a single default one is shared by all flows
+DEFAULT_CONTROLLER = InteractiveController()
+
+# Guards the lazy creation of per-flow synchronization primitives
+_CREATION_LOCK = Lock()
 
 
 class Flow:
@@ -17,9 +61,75 @@ class Flow:
     Args:
         iterable: The iterable to iterate over.
         messages: Optional dictionary with messages for pause, resume, and skip actions.
+        total: Optional number of items. When omitted, it is taken from `__len__` or
+            `operator.length_hint` if available, otherwise it stays None until the
+            iterable is exhausted. The iterable is never consumed to compute it.
         conditions: Optional function that takes the current item and returns True to skip.
+        batch_skip_condition: Optional function that takes a chunk of items and returns
+            a boolean mask (True to skip), evaluated once per `batch_size` items.
+            Surviving items keep their original indices.
+        batch_size: Number of items per chunk given to `batch_skip_condition`.
+        replay: Optional replay buffer, or its capacity, recording items read from
+            non-sliceable sources so the flow can seek backwards and restart.
+        controller: Optional pause controller deciding how a paused flow waits for
+            its next action. Defaults to prompting the user; `EventController`
+            sleeps until another thread calls `resume`, `skip` or `stop`.
+        prefetch: Number of items read ahead from sequential sources by a background
+            thread, overlapping slow reads with the consumer's work. Zero disables it.
+        metrics: Optional metrics recording throughput, consumer latency, skip ratio
+            and the time spent paused or inside the skip condition.
+        pause_condition: Optional function that takes the current item and returns
+            True to pause once that item is handed out. It is evaluated together
+            with the skip condition in a single call.
+        pause_every: Optional number of items after which the flow pauses, again and
+            again. Checked with one integer comparison per item.
+        pause_after: Optional number of seconds after the first read at which the
+            flow pauses, signalled by a timer thread instead of per-item checks.
+        events: Optional event bus notified of pauses, resumes, skips, stops and,
+            when someone subscribes to them, of the items handed out.
+
+    Sources indexed in O(1) (lists, tuples, ranges, strings, buffers, NumPy arrays
+    and mapped files) are read by index, so seeking, step lookups and restarts
+    cost O(1). Other iterables, including deques and pandas objects, are iterated
+    like any iterator; a DataFrame yields its column labels, as `iter` does.
     """
 
+    __slots__ = (
+        'total',
+        'iterator',
+        'paused',
+        'skipped',
+        'stopped',
+        'restart_on_get_item',
+        'current_item',
+        'verbose',
+        '_chunks',
+        '_view',
+        '_replay',
+        '_prefetcher',
+        '_source',
+        '_controller',
+        '_counter',
+        '_skip_condition',
+        '_conditions',
+        '_pause_at',
+        '_pause_every',
+        '_pause_after',
+        '_pause_timer',
+        '_fast',
+        '_autosave',
+        '_bookmarks',
+        '_search',
+        '_aggregates',
+        '_events',
+        '_item_events',
+        'metrics',
+        '_dead_letters',
+        '__condition',
+        '__messages',
+        '__weakref__',
+    )
+
     def __init__(
         self,
         iterable: Iterable,
@@ -27,79 +137,259 @@ class Flow:
         skip_condition: Condition = default_skip_condition,
         verbose: bool = False,
         restart_on_get_item: bool = True,
+        batch_skip_condition: 'BatchCondition' = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        replay: Union['ReplayBuffer', int] = None,
+        controller: PauseController = None,
+        metrics: 'FlowMetrics' = None,
+        prefetch: int = 0,
+        pause_condition: Condition = None,
+        pause_every: int = None,
+        pause_after: float = None,
+        events: 'EventBus' = None,
     ):
-        self.total = len(list(iterable)) if total is None else total
-        self.iterator = iter(iterable)
+        if pause_every is not None and pause_every < 1:
+            raise ValueError("Pause item count must be a positive integer.")
+
+        self.total = length_hint(iterable) if total is None else total
+
+        if batch_skip_condition is not None:
+            from .batching import MaskedChunks
+
+        # Vectorized skips pre-filter the source chunk by chunk
+        self._chunks = (
+            MaskedChunks(iterable, batch_skip_condition, batch_size)
+            if batch_skip_condition is not None
+            else None
+        )
+        self.iterator = iter(iterable) if self._chunks is None else self._chunks
+
+        # Random-access backend for index-addressable sources
+        self._view = positional_view(iterable) if self._chunks is None else None
+
+        # Replay buffer for the remaining sequential sources
+        if isinstance(replay, int):
+            from .replay import ReplayBuffer
+
+            replay = ReplayBuffer(capacity=replay)
+        self._replay = replay if self._view is None and self._chunks is None else None
+
+        # Read-ahead for sequential sources, random-access ones are indexed on demand
+        self._prefetcher = None
+        if prefetch and self._view is None and self._chunks is None:
+            from .prefetch import Prefetcher
+
+            self._prefetcher = Prefetcher(self.iterator, prefetch)
+            self.iterator = self._prefetcher
+
+        # Source opened by the flow itself, such as a mapped file, closed on exit
+        self._source = None
 
         self.paused: bool = False
         self.skipped: bool = False
         self.stopped = False
         self.restart_on_get_item = restart_on_get_item
 
-        self._messages: Dict = {
-            "pause": None,
-            "resume": None,
-            "skip": None,
-            "stop": None,
-        }
+        # Created on first use, most flows never pause nor log a message
+        self.__condition = None
+        self.__messages = None
+        self._controller = DEFAULT_CONTROLLER if controller is None else controller
 
         self._counter: int = 0
         self.current_item: object = None
 
         self._skip_condition = skip_condition
+        self._conditions = (
+            fuse_conditions(skip_condition, pause_condition)
+            if pause_condition is not None
+            else None
+        )
+
+        # Counter reaching the next count-based pause, never reached when disabled
+        self._pause_every = pause_every
+        self._pause_at = sys.maxsize if pause_every is None else pause_every
+
+        # The timer starts on the first read
+        self._pause_after = pause_after
+        self._pause_timer: Timer = None
 
         self.verbose = verbose
 
+        self._autosave: 'Autosave' = None
+        self._bookmarks: Dict = None
+        self._search: 'SearchIndex' = None
+        self._aggregates: 'Aggregates' = None
+
+        # Subscribing to items leaves the fast path
+        self._events = events
+        if events is not None:
+            events.watch(self._update_fast_path)
+        self.metrics = metrics
+        self._dead_letters: List['DeadLetter'] = None
+
+        self._update_fast_path()
+
     def __iter__(self):
         return self
 
-    def pause(self, message=None):
-        self.paused = True
-        self._messages["pause"] = (
-            message if message else action_default_message('Paused', self._counter)
+    @property
+    def _condition(self) -> ThreadCondition:
+        # Notified on every action, so paused threads wake up without polling
+        if self.__condition is None:
+            with _CREATION_LOCK:
+                if self.__condition is None:
+                    self.__condition = ThreadCondition()
+
+        return self.__condition
+
+    @property
+    def _messages(self) -> Dict:
+        if self.__messages is None:
+            self.__messages = ActionMessages()
+
+        return self.__messages
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """
+        Number of items left to read, None while the total is unknown.
+        """
+        if self.total is None:
+            return None
+
+        return max(self.total - self._counter, 0)
+
+    def progress(self, interval: float = 0.5, **kwargs) -> 'Progress':
+        """
+        Creates a progress tracker reporting a smoothed rate and an ETA.
+
+        Use it as a context manager to sample the flow from a background thread.
+
+        Args:
+            interval: Minimum number of seconds between two samples.
+            **kwargs: Further arguments given to `Progress`.
+        """
+        from .progress import Progress
+
+        return Progress(self, interval=interval, **kwargs)
+
+    def _update_fast_path(self):
+        """
+        Enables the fast path of `__next__` when no per-item feature is active.
+        """
+        events = self._events
+        self._item_events = events is not None and events.has_subscribers('item')
+        self._fast = (
+            self._skip_condition is default_skip_condition
+            and self._conditions is None
+            and self._pause_after is None
+            and self._chunks is None
+            and self._replay is None
+            and self._autosave is None
+            and self.metrics is None
+            and (self._search is None or self._view is not None)
+            and self._aggregates is None
+            and not self._item_events
         )
 
+    def pause(self, message=None):
+        with self._condition:
+            self.paused = True
+            self._condition.notify_all()
+
+        if self._prefetcher is not None:
+            self._prefetcher.pause()
+
+        self._messages["pause"] = message if message else ('Paused', self._counter)
+
         self.__print_message('pause')
 
+        if self._events is not None:
+            self._events.emit('pause', self._counter, message)
+
     def resume(self, message=None):
-        self.paused = False
-        self._messages["resume"] = (
-            message if message else action_default_message('Resumed', self._counter)
-        )
+        with self._condition:
+            self.paused = False
+            self._condition.notify_all()
+
+        if self._prefetcher is not None:
+            self._prefetcher.resume()
+
+        self._messages["resume"] = message if message else ('Resumed', self._counter)
 
         self.__print_message('resume')
 
+        if self._events is not None:
+            self._events.emit('resume', self._counter, message)
+
     def skip(self, message=None):
-        self.skipped = True
-        self._messages["skip"] = (
-            message if message else action_default_message('Skipped', self._counter)
-        )
+        with self._condition:
+            self.skipped = True
+            self._condition.notify_all()
+
+        self._messages["skip"] = message if message else ('Skipped', self._counter)
 
         self.__print_message('skip')
 
+        if self._events is not None:
+            self._events.emit('skip', self._counter, message)
+
     def stop(self, message=None):
-        self.stopped = True
-        self.paused = False
-        self._messages["stop"] = (
-            message if message else action_default_message('Stopped', self._counter)
-        )
+        with self._condition:
+            self.stopped = True
+            self.paused = False
+            self._condition.notify_all()
+
+        if self._prefetcher is not None:
+            self._prefetcher.close(wait=False)
+        if self._pause_timer is not None:
+            self._pause_timer.cancel()
+
+        self._messages["stop"] = message if message else ('Stopped', self._counter)
 
         self.__print_message('stop')
 
-    def __print_message(self, action: str, message: str = ''):
+        if self._events is not None:
+            self._events.emit('stop', self._counter, message)
+
+    def __print_message(self, action: str):
+        # Messages are neither formatted nor logged unless verbose
+        if not self.verbose:
+            return
+
         message = self._messages[action]
-        if message and self.verbose:
+        if message:
             logger.info(message)
 
-    def __check_skip_condition(self, item: object):
-        if self._skip_condition(item) or self.skipped:
-            self.skipped = False
-            self._counter += 1
-            return self.__next__()
+    def __check_skip_condition(self, item: object) -> bool:
+        if self._conditions is None:
+            skip = self._skip_condition(item)
         else:
-            counter = self._counter
-            self._counter += 1
-            return (counter, item)
+            flags = self._conditions(item)
+            if flags & PAUSE:
+                self.pause()
+            skip = flags & SKIP
+
+        if skip or self.skipped:
+            self.skipped = False
+            return True
+
+        return False
+
+    def wait_resumed(self, timeout: float = None) -> bool:
+        """
+        Blocks until the flow is resumed, skipped or stopped.
+
+        Args:
+            timeout: Optional number of seconds to wait.
+
+        Returns:
+            False if the timeout expired while still paused, True otherwise.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self.paused or self.skipped or self.stopped, timeout
+            )
 
     def _get_user_input(self):
         """
@@ -151,28 +441,133 @@ class Flow:
         Raises StopIteration when exhausted or explicitly stopped.
         Yields elements, skipping based on conditions and user input during pause.
         """
-        # Verify if stopped
-        if self.stopped:
-            raise StopIteration
+        # Fast path, taken when no action is pending and no per-item feature is on
+        if (
+            self._fast
+            and not (self.paused or self.skipped or self.stopped)
+            and self._counter < self._pause_at
+        ):
+            counter = self._counter
+            view = self._view
 
-        # Process pause state
-        while self.paused:
-            self._process_pause()
+            if view is None:
+                try:
+                    item = next(self.iterator)
+                except StopIteration:
+                    if self.total is None:
+                        self.total = counter
+                    raise
+            elif counter < len(view):
+                item = view[counter]
+            else:
+                raise StopIteration
 
-        # Verify if stopped after processing pause
-        if self.stopped:
-            raise StopIteration
+            self._counter = counter + 1
+            return (counter, item)
 
-        # Get the next item
-        try:
-            item = next(self.iterator)
-            return self.__check_skip_condition(item)
+        # Checkpoint before reading, every item handed out so far is processed
+        if self._autosave is not None:
+            self._autosave.tick(self)
 
-        # Raise StopIteration when exhausted
-        except StopIteration:
-            raise
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.on_request()
+
+        if self._pause_after is not None:
+            self.__start_pause_timer()
+
+        # Skipped items are consumed in a loop, keeping the stack depth constant
+        while True:
+            # Verify if stopped
+            if self.stopped:
+                raise StopIteration
+
+            # Count-based pauses, rescheduled from the counter in case of seeks
+            if self._counter >= self._pause_at:
+                every = self._pause_every
+                self._pause_at = (self._counter // every + 1) * every
+                self.pause()
+
+            # Process pause state through the pause controller
+            if self.paused:
+                began = perf_counter()
+                while self.paused:
+                    self._controller.handle(self)
+                if self._prefetcher is not None:
+                    self._prefetcher.resume()
+                if metrics is not None:
+                    metrics.paused_seconds += perf_counter() - began
+
+            # Verify if stopped after processing pause
+            if self.stopped:
+                raise StopIteration
+
+            # Get the next item, by index on random-access sources
+            try:
+                if self._replay is not None:
+                    item = self._replay.fetch(self._counter, self.iterator)
+                elif self._view is None:
+                    item = next(self.iterator)
+                elif self._counter < len(self._view):
+                    item = self._view[self._counter]
+                else:
+                    raise StopIteration
+
+            # Raise StopIteration when exhausted, settling an unknown total
+            except StopIteration:
+                if self._chunks is not None:
+                    self._counter = self._chunks.position
+                if self.total is None:
+                    self.total = self._counter
+                raise
+
+            # Items surviving a batch skip condition keep their original indices
+            counter = (
+                self._counter if self._chunks is None else self._chunks.position - 1
+            )
+            self._counter = counter + 1
+
+            if metrics is None:
+                skip = self.__check_skip_condition(item)
+            else:
+                began = perf_counter()
+                skip = self.__check_skip_condition(item)
+                metrics.skip_condition_seconds += perf_counter() - began
+
+            if skip:
+                if metrics is not None:
+                    metrics.skipped += 1
+                continue
+
+            if metrics is not None:
+                metrics.on_item()
+
+            # Sequential sources are indexed as items are handed out
+            if self._search is not None and self._view is None:
+                self._search.record(counter, item)
+
+            if self._aggregates is not None:
+                self._aggregates.add(item)
+
+            if self._item_events:
+                self._events.emit('item', counter, item)
+
+            return (counter, item)
+
+    def __start_pause_timer(self):
+        self._pause_timer = Timer(self._pause_after, self.pause)
+        self._pause_timer.daemon = True
+        self._pause_timer.start()
+
+        self._pause_after = None
+        self._update_fast_path()
 
     def fast_forward(self, steps: int):
+        # Random-access sources jump straight to the target position
+        if self._view is not None:
+            self._counter = min(self._counter + max(steps, 0), len(self._view))
+            return
+
         for i in range(steps):
             try:
                 self.__next__()
@@ -185,11 +580,73 @@ class Flow:
                 error_message = f"Error fast-forwarding the iterator at index {i}: {e}"
                 logger.error(error_message)
 
+    def seek(self, step: int):
+        """
+        Moves the flow so that the next item read is the one at the given step.
+
+        Random-access sources seek in O(1) in both directions. Other iterables move
+        forward consuming items without evaluating skip conditions, and backwards
+        only as far as their replay buffer reaches.
+
+        Args:
+            step: The step position to move to.
+
+        Raises:
+            ValueError: If the requested step cannot be reached.
+        """
+        if step < 0:
+            raise ValueError("Requested step is outside the valid range.")
+
+        if self._chunks is not None:
+            self._chunks.seek(step)
+            self._counter = step
+            return
+
+        if self._view is not None:
+            if step > len(self._view):
+                raise ValueError("Requested step is outside the valid range.")
+
+            self._counter = step
+            return
+
+        # Sources positioning themselves, such as queries, skip re-reading items
+        if self._replay is None and has_seek_hook(self.iterator):
+            self.iterator.seek(step)
+            self._counter = step
+            return
+
+        if step < self._counter:
+            if not self._can_replay_from(step):
+                raise ValueError("Cannot seek backwards past the replay buffer.")
+
+            self._counter = step
+            return
+
+        # Recorded items are replayed without reading them
+        if self._replay is not None:
+            self._counter = min(step, self._replay.end)
+
+        while self._counter < step:
+            try:
+                if self._replay is None:
+                    next(self.iterator)
+                else:
+                    self._replay.fetch(self._counter, self.iterator)
+            except StopIteration:
+                if self.total is None:
+                    self.total = self._counter
+                raise ValueError("Requested step is outside the valid range.")
+
+            self._counter += 1
+
     def _get_item_at_step(self, step: int):
         """
-        Retrieves the item at a specific step within the iterator by advancing it.
+        Retrieves the item at a specific step within the iterator.
 
-        This approach works for any iterable, but might be less efficient for large datasets.
+        Random-access sources are indexed directly, without re-iteration or skip
+        re-evaluation. Other iterables are advanced, which might be less efficient
+        for large datasets, and restarting from the current step then requires a
+        replay buffer or a source with a `seek(offset)` hook.
 
         Args:
             step: The step position of the desired item.
@@ -198,28 +655,645 @@ class Flow:
             The item at the specified step.
 
         Raises:
-            ValueError: If the requested step is outside the valid range.
+            ValueError: If the requested step is outside the valid range, or if the
+                flow cannot restart from the current step.
         """
-        # Check bounds using temporary list
-        if step < self._counter or step >= self.total:
+        if self._view is not None:
+            return self.__get_item_by_index(step)
+
+        # Check bounds, the upper one only when the total is already known
+        if step < self._counter or (self.total is not None and step >= self.total):
             raise ValueError("Requested step is outside the valid range.")
 
-        # Reset the iterator to the target step
+        seekable = self._replay is None and has_seek_hook(self.iterator)
+        if self.restart_on_get_item and self._replay is None and not seekable:
+            raise ValueError(
+                "Cannot restart a non-sliceable iterable without a replay buffer, "
+                "pass `replay` or `restart_on_get_item=False`."
+            )
+
+        # Advance the iterator to the target step
         counter_value = self._counter
-        self.fast_forward(step)
+        self.seek(step)
 
-        # Get the item at the target step
-        item = self.__next__()
+        # Get the item at the target step, an unknown total is settled on exhaustion
+        try:
+            item = self.__next__()
+        except StopIteration:
+            raise ValueError("Requested step is outside the valid range.")
 
-        # Optionally reset the iterator and counter for restart after processing
+        # Optionally restart from the previous counter, replaying recorded items
         if self.restart_on_get_item:
-            self.iterator = iter(self.iterator)
-            self.fast_forward(counter_value)
+            if self._can_replay_from(counter_value):
+                self._counter = counter_value
+            elif seekable:
+                self.seek(counter_value)
+            else:
+                raise ValueError(
+                    f"Cannot restart from step {counter_value}, the replay buffer "
+                    "no longer holds the items read since."
+                )
 
         return item
 
+    def _can_replay_from(self, step: int) -> bool:
+        return self._replay is not None and self._replay.can_replay_from(step)
+
+    def __get_item_by_index(self, step: int):
+        if step < 0 or step >= len(self._view):
+            raise ValueError("Requested step is outside the valid range.")
+
+        # Restarting keeps the counter untouched, otherwise resume after the step
+        if not self.restart_on_get_item:
+            self._counter = step + 1
+
+        return (step, self._view[step])
+
+    def index_by(self, key: Callable = None, sorted: bool = False) -> 'SearchIndex':
+        """
+        Indexes the flow items by key, so that `find` avoids linear scans.
+
+        Random-access sources are searched directly, in O(log n) when sorted and
+        in O(1) after a single scan otherwise. Sequential sources are indexed as
+        items are handed out, so only items already read can be found. Items the
+        skip condition drops are never found.
+
+        Args:
+            key: Optional function extracting the search key of an item.
+            sorted: Whether the source is sorted by key, enabling binary search.
+
+        Returns:
+            The search index attached to the flow.
+        """
+        from .search import SearchIndex
+
+        skip_condition = (
+            None
+            if self._skip_condition is default_skip_condition
+            else self._skip_condition
+        )
+        self._search = SearchIndex(
+            key=key, sorted=sorted, view=self._view, skip_condition=skip_condition
+        )
+        self._update_fast_path()
+
+        return self._search
+
+    def find(self, value: object) -> Optional[int]:
+        """
+        Returns the step of the first item with the given key, None if not found.
+
+        Raises:
+            ValueError: If the flow is not indexed, see `index_by`.
+        """
+        if self._search is None:
+            raise ValueError("Searching requires an index, see `index_by`.")
+
+        return self._search.find(value)
+
+    def bookmark(self, name: str, step: int = None):
+        """
+        Names a step, the current one by default, to come back to it with `goto`.
+
+        Bookmarks are saved in checkpoints.
+        """
+        if self._bookmarks is None:
+            self._bookmarks = {}
+
+        self._bookmarks[name] = self._counter if step is None else step
+
+    @property
+    def bookmarks(self) -> Dict[str, int]:
+        return dict(self._bookmarks or {})
+
+    def goto(self, name: str):
+        """
+        Seeks the flow to a bookmarked step.
+
+        Raises:
+            KeyError: If the bookmark does not exist.
+        """
+        if not self._bookmarks or name not in self._bookmarks:
+            raise KeyError(f"Bookmark {name} not found")
+
+        self.seek(self._bookmarks[name])
+
+    def aggregate(self, key: Callable = None, **kwargs) -> 'Aggregates':
+        """
+        Computes running aggregates over the items handed out, in a single pass.
+
+        Items are aggregated in buffered batches, and batches read with `batches`
+        are aggregated at once, vectorized on NumPy arrays. Aggregates of several
+        flows can be merged.
+
+        Args:
+            key: Optional function extracting the aggregated value of an item.
+            **kwargs: Further arguments given to `Aggregates`.
+
+        Returns:
+            The aggregates attached to the flow, see `Aggregates.summary`.
+        """
+        from .aggregates import Aggregates
+
+        self._aggregates = Aggregates(key=key, **kwargs)
+        self._update_fast_path()
+
+        return self._aggregates
+
+    def map(
+        self,
+        fn: Callable,
+        workers: int = 4,
+        executor: str = 'thread',
+        ordered: bool = True,
+        max_pending: int = None,
+    ) -> Iterator[Tuple[int, object]]:
+        """
+        Applies a function to each item concurrently on a thread or process pool.
+
+        Pausing stops new submissions, skipping applies to the next item read and
+        stopping cancels the pending futures. Results keep their item indices.
+
+        Args:
+            fn: The function to apply, picklable when using processes.
+            workers: Number of pool workers.
+            executor: Either 'thread' or 'process'.
+            ordered: Whether to yield results in index order or as they complete.
+            max_pending: Maximum number of items in flight, twice the workers by default.
+
+        Returns:
+            An iterator of `(index, result)` pairs.
+        """
+        from .mapping import parallel_map
+
+        max_pending = 2 * workers if max_pending is None else max_pending
+
+        return parallel_map(self, fn, workers, executor, ordered, max_pending)
+
+    def batches(
+        self,
+        size: int = 1024,
+        kind: str = 'list',
+        target_latency: float = None,
+        max_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Tuple[int, object]]:
+        """
+        Iterates over chunks of up to `size` items, with flow control per batch.
+
+        Pause and stop are checked once per batch and skipping drops the next batch.
+        The skip condition, when not the default, filters items within list and
+        tuple batches. Pause conditions and `pause_every` pause the flow once the
+        batch holding the matching item or crossing the count is handed out.
+
+        Args:
+            size: Number of items per batch, the initial one in adaptive mode.
+            kind: Either 'list', 'tuple' or 'view'. Views are zero-copy slices on
+                NumPy arrays and buffers such as `array.array`.
+            target_latency: Optional number of seconds the consumer should spend on
+                each batch. Batches are resized after each one to reach it.
+            max_size: Upper bound for adaptive batch sizes.
+
+        Returns:
+            An iterator of `(start, batch)` pairs, where `start` is the index of the
+            first item covered by the batch.
+        """
+        if kind == 'view' and self._view is None:
+            raise ValueError("Batch views require a random-access source.")
+        filtered = (
+            self._skip_condition is not default_skip_condition
+            or self._conditions is not None
+        )
+        if kind == 'view' and filtered:
+            raise ValueError("Batch views cannot be filtered by item conditions.")
+
+        from .batching import iter_batches
+
+        return iter_batches(self, size, kind, target_latency, max_size)
+
+    def _read_batch(self, size: int, kind: str):
+        """
+        Reads up to `size` items, returning the start index, the batch and the
+        number of source items consumed.
+        """
+        start = self._counter
+        conditions = self._conditions
+        filtered = (
+            conditions is not None or self._skip_condition is not default_skip_condition
+        )
+        aggregates = self._aggregates
+
+        if self._view is not None:
+            stop = max(start, min(start + size, len(self._view)))
+            self._counter = stop
+
+            if kind == 'view':
+                from .batching import buffer_view
+
+                buffer = buffer_view(self._view)
+                source = self._view if buffer is None else buffer
+                if aggregates is not None:
+                    aggregates.update_batch(self._view[start:stop])
+                return start, source[start:stop], stop - start
+
+            batch = self._view[start:stop]
+            count = stop - start
+
+        elif self._replay is None and self._chunks is None:
+            batch = list(islice(self.iterator, size))
+            count = len(batch)
+            self._counter += count
+
+            if count < size and self.total is None:
+                self.total = self._counter
+
+        else:
+            # Replayed and pre-filtered sources keep their per-item bookkeeping
+            pairs = []
+            try:
+                while len(pairs) < size:
+                    pairs.append(self.__next__())
+            except StopIteration:
+                pass
+
+            start = pairs[0][0] if pairs else self._counter
+            batch = [item for _, item in pairs]
+            count = len(batch)
+            filtered = False
+            aggregates = None
+
+        if filtered and conditions is None:
+            batch = [item for item in batch if not self._skip_condition(item)]
+        elif filtered:
+            flags = [conditions(item) for item in batch]
+            if any(flag & PAUSE for flag in flags):
+                self.pause()
+            batch = [item for item, flag in zip(batch, flags) if not flag & SKIP]
+
+        # Whole batches are aggregated at once, vectorized on arrays
+        if aggregates is not None:
+            aggregates.update_batch(batch)
+
+        if kind == 'tuple':
+            return start, tuple(batch), count
+
+        return start, (batch if isinstance(batch, list) else list(batch)), count
+
+    def checkpoint(self, path: str):
+        """
+        Saves the flow state (counter, action flags, bookmarks and messages) to disk.
+
+        The file is replaced atomically, so a crash never leaves a partial checkpoint.
+
+        Args:
+            path: Path of the checkpoint file.
+        """
+        from .checkpoint import flow_state, save_checkpoint
+
+        save_checkpoint(flow_state(self), path)
+
+    def autosave(
+        self, path: str, every: int = None, interval: float = None
+    ) -> 'Autosave':
+        """
+        Checkpoints the flow every `every` items and/or every `interval` seconds.
+
+        Checkpoints are taken before reading the next item, so the saved counter
+        only covers items the consumer is done with. A final checkpoint is saved
+        when leaving the flow's context.
+
+        Args:
+            path: Path of the checkpoint file.
+            every: Optional number of items between two checkpoints.
+            interval: Optional number of seconds between two checkpoints.
+
+        Returns:
+            The autosave settings attached to the flow.
+        """
+        from .checkpoint import Autosave
+
+        self._autosave = Autosave(path, every=every, interval=interval)
+        self._update_fast_path()
+
+        return self._autosave
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        format: str = 'lines',
+        record_size: int = None,
+        cache: bool = True,
+        **kwargs,
+    ) -> 'Flow':
+        """
+        Creates a flow over the records of a memory-mapped file.
+
+        Records are zero-copy memoryview slices. The file is indexed once, so the
+        total is known upfront and seeking, step lookups and restarts cost O(1).
+        Leaving the flow's context unmaps the file.
+
+        Args:
+            path: Path of the file.
+            format: Either 'lines', 'fixed' or 'jsonl', see `MappedFile`.
+            record_size: Number of bytes per record, required by the 'fixed' format.
+            cache: Whether to cache the offset index next to the file.
+            **kwargs: Further arguments given to the flow.
+
+        Returns:
+            The flow over the file records.
+        """
+        from .sources import MappedFile
+
+        source = MappedFile(path, format=format, record_size=record_size, cache=cache)
+        flow = cls(source, **kwargs)
+        flow._source = source
+
+        return flow
+
+    @classmethod
+    def from_query(
+        cls,
+        connect: Union[Callable, 'ConnectionPool'],
+        sql: str,
+        params: Sequence = (),
+        batch_size: int = 1000,
+        key: str = None,
+        **kwargs,
+    ) -> 'Flow':
+        """
+        Creates a flow streaming the rows of a database query.
+
+        Rows are fetched in batches of `batch_size`, without loading the result
+        set in memory. Connections come from a pool, given or created for the
+        flow. Paginating by a unique `key` column lets seeking and restoring
+        resume the query near the target row instead of reading earlier rows.
+
+        Args:
+            connect: Function opening a DB-API connection, or a `ConnectionPool`.
+            sql: The query.
+            params: Query parameters.
+            batch_size: Number of rows fetched at once.
+            key: Optional name of a unique column to order and paginate by.
+            **kwargs: Further arguments given to the flow.
+
+        Returns:
+            The flow over the query rows.
+        """
+        from .sources import QuerySource
+
+        source = QuerySource(
+            connect, sql, params=params, batch_size=batch_size, key=key
+        )
+        flow = cls(source, **kwargs)
+        flow._source = source
+
+        return flow
+
+    @classmethod
+    def restore(cls, path: str, iterable: Iterable, **kwargs) -> 'Flow':
+        """
+        Creates a flow over `iterable` resuming from a checkpoint.
+
+        Random-access sources are indexed directly and sources providing a
+        `seek(offset)` hook are asked to position themselves on the item offset,
+        after getting back the state they saved in the checkpoint, if any, through
+        `restore_state(state)`. Other iterables are advanced without evaluating
+        skip conditions.
+
+        Args:
+            path: Path of the checkpoint file.
+            iterable: The iterable the checkpointed flow was iterating over.
+            **kwargs: Further arguments given to the flow.
+
+        Returns:
+            The restored flow.
+        """
+        from .checkpoint import has_state_hook, load_checkpoint
+
+        state = load_checkpoint(path)
+        counter = state["counter"]
+
+        sequential = (
+            positional_view(iterable) is None
+            and kwargs.get('batch_skip_condition') is None
+        )
+        if sequential and has_seek_hook(iterable):
+            if state.get("source") is not None and has_state_hook(iterable):
+                iterable.restore_state(state["source"])
+
+            # Positioned before the flow wraps it, e.g. in a prefetcher
+            iterable.seek(counter)
+            flow = cls(iterable, **kwargs)
+            flow._counter = counter
+            if flow._replay is not None:
+                flow._replay.start_at(counter)
+        else:
+            flow = cls(iterable, **kwargs)
+            flow.seek(counter)
+
+        if flow.total is None:
+            flow.total = state["total"]
+
+        flow.paused = state["paused"]
+        flow.skipped = state["skipped"]
+        flow.stopped = state["stopped"]
+        flow._bookmarks = state["bookmarks"] or None
+        flow._messages.update(state["messages"])
+
+        return flow
+
+    def run(
+        self,
+        fn: Callable,
+        retries: int = 3,
+        backoff: float = 0.1,
+        jitter: float = 0.1,
+        on_give_up: str = 'skip',
+        workers: int = 1,
+        max_backoff: float = 60.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> List[Tuple[int, object]]:
+        """
+        Applies a function to every item, retrying failed items with backoff.
+
+        Failed items wait in a delay queue without holding a worker, so healthy
+        items keep being processed meanwhile. Items still failing after all their
+        retries are collected in `dead_letters` for later replay.
+
+        Args:
+            fn: The function to apply to each item.
+            retries: Number of retries after the first failed attempt.
+            backoff: Delay in seconds before the first retry, doubled at each retry.
+            jitter: Fraction of the delay added at random, spreading retries out.
+            on_give_up: Action taken when an item runs out of retries ('skip',
+                'pause' or 'stop').
+            workers: Number of worker threads.
+            max_backoff: Upper bound in seconds for the delay between two attempts.
+            retry_on: Exception types worth retrying, others are raised right away.
+
+        Returns:
+            The `(index, result)` pairs of the successful items, in completion order.
+        """
+        from .retry import run_with_retries
+
+        if self._dead_letters is None:
+            self._dead_letters = []
+
+        return list(
+            run_with_retries(
+                self,
+                fn,
+                retries=retries,
+                backoff=backoff,
+                jitter=jitter,
+                max_backoff=max_backoff,
+                on_give_up=on_give_up,
+                workers=workers,
+                retry_on=retry_on,
+                dead_letters=self._dead_letters,
+            )
+        )
+
+    @property
+    def dead_letters(self) -> List['DeadLetter']:
+        """
+        Items that failed all their attempts in `run`, with their last error.
+        """
+        if self._dead_letters is None:
+            self._dead_letters = []
+
+        return self._dead_letters
+
+    @staticmethod
+    def merge(*flows: Iterable, key: Callable = None, **kwargs) -> 'Flow':
+        """
+        Merges already sorted flows into one sorted flow, streaming in O(N log k).
+
+        Args:
+            *flows: The sorted flows or iterables to merge.
+            key: Optional function extracting the comparison key of each item.
+            **kwargs: Further arguments given to the combined flow.
+
+        Returns:
+            A flow of `(source, index, item)` triples.
+        """
+        from .combinators import CombinedFlow, as_flow, merge_sorted
+
+        children = [as_flow(flow) for flow in flows]
+        return CombinedFlow(children, merge_sorted(children, key), **kwargs)
+
+    @staticmethod
+    def interleave(*flows: Iterable, **kwargs) -> 'Flow':
+        """
+        Alternates between flows, one item from each in turn.
+
+        Returns:
+            A flow of `(source, index, item)` triples.
+        """
+        from .combinators import CombinedFlow, as_flow, interleave_flows
+
+        children = [as_flow(flow) for flow in flows]
+        return CombinedFlow(children, interleave_flows(children), **kwargs)
+
+    @staticmethod
+    def chain(*flows: Iterable, **kwargs) -> 'Flow':
+        """
+        Iterates over flows one after the other.
+
+        Returns:
+            A flow of `(source, index, item)` triples.
+        """
+        from .combinators import CombinedFlow, as_flow, chain_flows
+
+        children = [as_flow(flow) for flow in flows]
+        return CombinedFlow(children, chain_flows(children), **kwargs)
+
+    def tee(
+        self,
+        n: int = 2,
+        buffer_size: int = 1024,
+        reader_timeout: float = 1.0,
+        **kwargs,
+    ) -> List['Flow']:
+        """
+        Splits the flow into `n` flows receiving every item, reading the source once.
+
+        Items are shared by reference. Each child has a bounded buffer and its own
+        pause, skip and stop; a lagging child throttles the source instead of
+        letting the buffers grow, so children consumed from a single thread must
+        stay within `buffer_size` items of each other. Reading further raises a
+        RuntimeError instead of waiting for a child no other thread reads.
+
+        Args:
+            n: Number of child flows.
+            buffer_size: Maximum number of items buffered per child.
+            reader_timeout: Seconds a read waits for a thread to start reading a
+                full child before raising.
+            **kwargs: Further arguments given to the child flows.
+        """
+        from .branching import branch_flows
+
+        kwargs.setdefault('total', self.remaining)
+        return branch_flows(self, [None] * n, buffer_size, reader_timeout, **kwargs)
+
+    def branch(
+        self,
+        predicates: Dict[str, Callable],
+        buffer_size: int = 1024,
+        reader_timeout: float = 1.0,
+        **kwargs,
+    ) -> Dict[str, 'Flow']:
+        """
+        Routes each item to the child flows whose predicate accepts it.
+
+        An item may go to several children or, when no predicate accepts it, to
+        none. Buffering and backpressure work as in `tee`.
+
+        Args:
+            predicates: Predicate of each child flow, by name.
+            buffer_size: Maximum number of items buffered per child.
+            reader_timeout: Seconds a read waits for a thread to start reading a
+                full child before raising.
+            **kwargs: Further arguments given to the child flows.
+        """
+        from .branching import branch_flows
+
+        children = branch_flows(
+            self, list(predicates.values()), buffer_size, reader_timeout, **kwargs
+        )
+        return dict(zip(predicates, children))
+
+    def on(self, event: str, handler: 'Handler') -> Callable[[], None]:
+        """
+        Subscribes a handler to the flow events, creating an event bus if needed.
+
+        Handlers are called with the event name, the counter and either the item
+        ('item' event) or the action message ('pause', 'resume', 'skip', 'stop').
+
+        Returns:
+            A function unsubscribing the handler.
+        """
+        if self._events is None:
+            from .events import EventBus
+
+            self._events = EventBus()
+            self._events.watch(self._update_fast_path)
+
+        return self._events.subscribe(event, handler)
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        if self._autosave is not None:
+            self._autosave.save(self)
+        if self._replay is not None:
+            self._replay.close()
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+        if self._source is not None:
+            self._source.close()
+        if self._pause_timer is not None:
+            self._pause_timer.cancel()
+        if self._events is not None:
+            self._events.close()
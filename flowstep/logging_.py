@@ -1,29 +1,60 @@
+from functools import lru_cache
 from sys import stderr, stdout
-from loguru import logger
-from os import getlogin
+from typing import List
+
+from loguru import logger as _root_logger
 
 # Define the format for the logs
 log_format = "{time:YYYY-MM-DD at HH:mm:ss} | {level} | {message}"
 
-# Configure the logger
-try:
-    username=getlogin()
-except Exception:
-    username="flowstep"
-
-config = {
-    "handlers": [
-        {"sink": stdout, "format": log_format, "level": "INFO"},
-        {"sink": stderr, "format": log_format, "level": "ERROR"},
-        {"sink": "logs.log", "format": log_format, "level": "DEBUG"},
-        {
-            "sink": "logs.log",
-            "format": log_format,
-            "level": "TRACE",
-            "enqueue": True,
-            "diagnose": True,
-        },
-    ],
-    "extra": {"user": username},
-}
-logger.configure(**config)
+
+@lru_cache(maxsize=None)
+def get_username() -> str:
+    # Imported and resolved lazily, `getlogin` fails without a controlling terminal
+    from os import getlogin
+
+    try:
+        return getlogin()
+    except Exception:
+        return "flowstep"
+
+
+def _bind_user(record):
+    record["extra"].setdefault("user", get_username())
+
+
+# Binds the user to flowstep's own records, leaving the application's extra alone
+logger = _root_logger.patch(_bind_user)
+
+# Silent like a library with a null handler, until `configure_logging` is called
+_root_logger.disable("flowstep")
+
+
+def configure_logging(log_file: str = None, enqueue: bool = False) -> List[int]:
+    """
+    Adds flowstep's console and optional file sinks to the loguru logger.
+
+    Importing flowstep does not touch the application's logging configuration
+    and disables the library's messages. Call this function to enable them and
+    opt into the library's own sinks.
+
+    Args:
+        log_file: Optional path of a file receiving DEBUG messages and above.
+        enqueue: Whether file messages are written by a background thread.
+
+    Returns:
+        The identifiers of the added handlers, to be given to `logger.remove`.
+    """
+    _root_logger.enable("flowstep")
+
+    handlers = [
+        logger.add(stdout, format=log_format, level="INFO"),
+        logger.add(stderr, format=log_format, level="ERROR"),
+    ]
+
+    if log_file is not None:
+        handlers.append(
+            logger.add(log_file, format=log_format, level="DEBUG", enqueue=enqueue)
+        )
+
+    return handlers
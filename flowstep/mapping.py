@@ -0,0 +1,91 @@
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Iterator, Tuple
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def make_executor(executor: str, workers: int) -> Executor:
+    if workers < 1:
+        raise ValueError("Number of workers must be a positive integer.")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor {executor} not supported")
+
+    return EXECUTORS[executor](max_workers=workers)
+
+
+def parallel_map(
+    flow,
+    fn: Callable,
+    workers: int,
+    executor: str,
+    ordered: bool,
+    max_pending: int,
+) -> Iterator[Tuple[int, object]]:
+    """
+    Applies `fn` to the items of a flow concurrently, yielding `(index, result)`.
+
+    At most `max_pending` items are in flight. New items are only submitted while
+    the flow is not paused; once in-flight results are drained, the flow's own
+    pause handling takes over. Stopping the flow cancels the pending futures.
+    """
+    if max_pending < 1:
+        raise ValueError("Maximum pending items must be a positive integer.")
+
+    pool = make_executor(executor, workers)
+    pending: deque = deque()
+    exhausted = False
+
+    def submit() -> bool:
+        try:
+            index, item = next(flow)
+        except StopIteration:
+            return False
+
+        pending.append((index, pool.submit(fn, item)))
+        return True
+
+    try:
+        while True:
+            # Keep the pool busy while the flow is running
+            while not exhausted and not flow.paused and len(pending) < max_pending:
+                exhausted = not submit()
+
+            if flow.stopped:
+                break
+
+            if not pending:
+                if exhausted:
+                    break
+
+                # Nothing in flight, let the flow process its pause state
+                exhausted = not submit()
+                continue
+
+            if ordered:
+                index, future = pending.popleft()
+                yield index, future.result()
+            else:
+                done, _ = wait(
+                    [future for _, future in pending], return_when=FIRST_COMPLETED
+                )
+                for entry in [entry for entry in pending if entry[1] in done]:
+                    pending.remove(entry)
+                    yield entry[0], entry[1].result()
+
+                    if flow.stopped:
+                        return
+
+    finally:
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
@@ -0,0 +1,217 @@
+from time import perf_counter
+from typing import Dict, List
+
+from .utils import atomic_write
+
+# Sub-buckets per power of two, bounding the relative error of recorded values
+HISTOGRAM_PRECISION_BITS = 4
+
+LATENCY_PERCENTILES = [50, 90, 99]
+
+
+class LogHistogram:
+    """
+    HDR-style histogram of durations with log-linear integer buckets.
+
+    Durations are recorded in nanoseconds. Each power of two is split into
+    `2 ** precision_bits` linear sub-buckets, so recording is a couple of integer
+    operations and percentiles have a bounded relative error (about 6% by default).
+    Histograms with the same precision can be merged.
+
+    Args:
+        precision_bits: Number of bits of sub-bucket resolution.
+    """
+
+    def __init__(self, precision_bits: int = HISTOGRAM_PRECISION_BITS):
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self._counts: List[int] = []
+
+        self.count: int = 0
+        self.total: int = 0
+        self.min: int = None
+        self.max: int = None
+
+    def _bucket(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return value
+
+        shift = value.bit_length() - self.precision_bits - 1
+        return (shift + 1) * self._sub_buckets + (value >> shift) - self._sub_buckets
+
+    def _lowest_value(self, bucket: int) -> int:
+        if bucket < self._sub_buckets:
+            return bucket
+
+        shift, offset = divmod(bucket, self._sub_buckets)
+        return (self._sub_buckets + offset) << (shift - 1)
+
+    def record(self, seconds: float):
+        value = max(int(seconds * 1e9), 0)
+        bucket = self._bucket(value)
+
+        if bucket >= len(self._counts):
+            self._counts.extend([0] * (bucket + 1 - len(self._counts)))
+        self._counts[bucket] += 1
+
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Returns the duration, in seconds, below which `percentile` % of values fall.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, round(self.count * percentile / 100))
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                highest = self._lowest_value(bucket + 1) - 1
+                return min(highest, self.max) / 1e9
+
+        return self.max / 1e9
+
+    def merge(self, other: 'LogHistogram'):
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Histograms with different precisions cannot be merged.")
+
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for bucket, count in enumerate(other._counts):
+            self._counts[bucket] += count
+
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def summary(self) -> Dict:
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count / 1e9 if self.count else 0.0,
+            "max": (self.max or 0) / 1e9,
+        }
+        for percentile in LATENCY_PERCENTILES:
+            summary[f"p{percentile}"] = self.percentile(percentile)
+
+        return summary
+
+
+class FlowMetrics:
+    """
+    Low-overhead counters describing where a flow spends its time.
+
+    Records the items yielded and skipped, the time spent paused and inside the
+    skip condition, and the latency of the consumer's work between two `__next__`
+    calls. Attach it with `Flow(..., metrics=FlowMetrics())`.
+
+    Args:
+        exporters: Optional exporters called by `export` with the snapshot.
+    """
+
+    def __init__(self, exporters: List = None):
+        self.exporters = list(exporters or [])
+
+        self.items: int = 0
+        self.skipped: int = 0
+        self.paused_seconds: float = 0.0
+        self.skip_condition_seconds: float = 0.0
+        self.consumer_latency = LogHistogram()
+
+        self._started: float = None
+        self._returned: float = None
+        self._finished: float = None
+
+    def on_request(self):
+        now = perf_counter()
+
+        if self._started is None:
+            self._started = now
+        if self._returned is not None:
+            self.consumer_latency.record(now - self._returned)
+            self._returned = None
+
+    def on_item(self):
+        self.items += 1
+        self._returned = self._finished = perf_counter()
+
+    def snapshot(self) -> Dict:
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._finished or self._started) - self._started
+
+        checked = self.items + self.skipped
+
+        return {
+            "items": self.items,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / checked if checked else 0.0,
+            "elapsed_seconds": elapsed,
+            "items_per_second": self.items / elapsed if elapsed > 0 else 0.0,
+            "paused_seconds": self.paused_seconds,
+            "skip_condition_seconds": self.skip_condition_seconds,
+            "consumer_latency_seconds": self.consumer_latency.summary(),
+        }
+
+    def export(self):
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter.export(snapshot)
+
+
+class PrometheusExporter:
+    """
+    Writes metric snapshots to a file in the Prometheus text exposition format.
+
+    The file is replaced atomically, e.g. for the node exporter textfile collector.
+
+    Args:
+        path: Path of the metrics file.
+        prefix: Prefix of the metric names.
+        labels: Optional labels added to every metric.
+    """
+
+    def __init__(self, path: str, prefix: str = 'flowstep', labels: Dict = None):
+        self.path = path
+        self.prefix = prefix
+        self.labels = labels or {}
+
+    def _labels(self, **extra) -> str:
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ''
+
+        return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+    def render(self, snapshot: Dict) -> str:
+        lines = []
+        latency = snapshot["consumer_latency_seconds"]
+
+        for name, value in snapshot.items():
+            if isinstance(value, dict):
+                continue
+
+            kind = 'counter' if name in ('items', 'skipped') else 'gauge'
+            suffix = '_total' if kind == 'counter' else ''
+
+            lines.append(f"# TYPE {self.prefix}_{name}{suffix} {kind}")
+            lines.append(f"{self.prefix}_{name}{suffix}{self._labels()} {value}")
+
+        name = f"{self.prefix}_consumer_latency_seconds"
+        lines.append(f"# TYPE {name} summary")
+        for percentile in LATENCY_PERCENTILES:
+            labels = self._labels(quantile=percentile / 100)
+            lines.append(f"{name}{labels} {latency[f'p{percentile}']}")
+        lines.append(f"{name}_sum{self._labels()} {latency['mean'] * latency['count']}")
+        lines.append(f"{name}_count{self._labels()} {latency['count']}")
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, snapshot: Dict):
+        atomic_write(self.path, self.render(snapshot))
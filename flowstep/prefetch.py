@@ -0,0 +1,127 @@
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Iterator
+
+# Marks the end of the source
+_EXHAUSTED = object()
+
+# Seconds between two checks of the closed flag by a blocked producer
+POLL_INTERVAL = 0.05
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Prefetcher:
+    """
+    Reads items ahead of the consumer on a background thread.
+
+    A bounded queue of `size` items applies backpressure: the producer blocks once
+    it is full. Pausing stops the producer after its current read, and closing it
+    also discards the queued items. Errors raised by the source are re-raised to
+    the consumer in order.
+
+    Args:
+        iterator: The source iterator.
+        size: Maximum number of items read ahead.
+    """
+
+    def __init__(self, iterator: Iterator, size: int):
+        if size < 1:
+            raise ValueError("Prefetch size must be a positive integer.")
+
+        self._source = iterator
+        self._queue: Queue = Queue(maxsize=size)
+
+        self._running = Event()
+        self._running.set()
+        self._closed = Event()
+        self._thread: Thread = None
+        self._exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def _put(self, value: object) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(value, timeout=POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def _produce(self):
+        while not self._closed.is_set():
+            self._running.wait()
+            if self._closed.is_set():
+                return
+
+            try:
+                value = next(self._source)
+            except StopIteration:
+                self._put(_EXHAUSTED)
+                return
+            except BaseException as error:
+                self._put(_Failure(error))
+                return
+
+            if not self._put(value):
+                return
+
+    def __next__(self):
+        if self._exhausted:
+            raise StopIteration
+
+        if self._thread is None:
+            self._thread = Thread(
+                target=self._produce, name="flowstep-prefetch", daemon=True
+            )
+            self._thread.start()
+
+        value = self._queue.get()
+
+        if value is _EXHAUSTED:
+            self._exhausted = True
+            raise StopIteration
+        if isinstance(value, _Failure):
+            self._exhausted = True
+            raise value.error
+
+        return value
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def close(self, wait: bool = True):
+        """
+        Stops the producer and discards the items read ahead.
+
+        Args:
+            wait: Whether to wait for the producer to finish its current read.
+        """
+        self._closed.set()
+        self._running.set()
+        self._exhausted = True
+
+        # Drain so a producer blocked on a full queue notices the closed flag
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Empty:
+            pass
+
+        # Wakes a consumer blocked on the empty queue
+        try:
+            self._queue.put_nowait(_EXHAUSTED)
+        except Full:
+            pass
+
+        if wait and self._thread is not None:
+            self._thread.join()
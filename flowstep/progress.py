@@ -0,0 +1,153 @@
+import sys
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Dict
+
+# Weight of the latest rate sample in the moving average
+DEFAULT_SMOOTHING = 0.3
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def render_progress(snapshot: Dict, stream=None):
+    """
+    Writes a one-line progress report, rate-only when the total is unknown.
+    """
+    stream = sys.stderr if stream is None else stream
+
+    counter, total = snapshot["counter"], snapshot["total"]
+
+    line = f"{counter}"
+    if total is not None:
+        percent = 100 * counter / total if total else 100.0
+        line += f"/{total} ({percent:.1f}%)"
+
+    line += f" | {snapshot['rate']:.1f} it/s"
+    if snapshot["eta"] is not None:
+        line += f" | ETA {format_duration(snapshot['eta'])}"
+
+    stream.write(f"\r{line}")
+    stream.flush()
+
+
+class Progress:
+    """
+    Tracks the progress of a flow with a smoothed rate and an ETA.
+
+    The flow is only sampled, never instrumented: either a background ticker
+    thread samples it every `interval` seconds (see `start`), or the consumer calls
+    `tick`, which does nothing until `interval` seconds have elapsed. Iterating
+    therefore costs nothing extra per item. Flows with an unknown total report
+    the rate only.
+
+    Args:
+        flow: The flow to track.
+        interval: Minimum number of seconds between two samples.
+        smoothing: Weight of the latest sample in the exponential moving average.
+        render: Optional function called with each snapshot, `render_progress` by default.
+    """
+
+    def __init__(
+        self,
+        flow,
+        interval: float = 0.5,
+        smoothing: float = DEFAULT_SMOOTHING,
+        render: Callable[[Dict], None] = render_progress,
+    ):
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing must be in the (0, 1] interval.")
+
+        self.flow = flow
+        self.interval = interval
+        self.smoothing = smoothing
+        self.render = render
+
+        self.rate: float = None
+        self._last_counter = flow._counter
+        self._last_time = monotonic()
+
+        self._stopped = Event()
+        self._thread: Thread = None
+
+    def update(self) -> Dict:
+        """
+        Samples the flow, updating the moving average of its rate.
+        """
+        now = monotonic()
+        counter = self.flow._counter
+        elapsed = now - self._last_time
+
+        if elapsed > 0:
+            rate = (counter - self._last_counter) / elapsed
+            self.rate = (
+                rate
+                if self.rate is None
+                else self.smoothing * rate + (1 - self.smoothing) * self.rate
+            )
+
+        self._last_counter = counter
+        self._last_time = now
+
+        snapshot = self.snapshot()
+        if self.render is not None:
+            self.render(snapshot)
+
+        return snapshot
+
+    def tick(self):
+        """
+        Samples the flow if at least `interval` seconds went by since the last sample.
+        """
+        if monotonic() - self._last_time >= self.interval:
+            self.update()
+
+    def snapshot(self) -> Dict:
+        remaining = self.flow.remaining
+        rate = self.rate or 0.0
+
+        return {
+            "counter": self.flow._counter,
+            "total": self.flow.total,
+            "remaining": remaining,
+            "rate": rate,
+            "eta": remaining / rate if remaining is not None and rate > 0 else None,
+        }
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.update()
+
+    def start(self) -> 'Progress':
+        """
+        Starts a background ticker thread sampling the flow every `interval` seconds.
+        """
+        if self._thread is None:
+            self._thread = Thread(
+                target=self._run, name="flowstep-progress", daemon=True
+            )
+            self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        # A last sample reports the final state
+        self.update()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
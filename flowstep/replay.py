@@ -0,0 +1,152 @@
+import pickle
+from collections import OrderedDict
+from tempfile import TemporaryFile
+from typing import Dict, Iterator
+
+REPLAY_POLICIES = ['window', 'lru']
+
+
+class ReplayBuffer:
+    """
+    Bounded record of the items produced by a non-sliceable source.
+
+    Lets a flow seek backwards and restart without re-running the upstream
+    iterator. At most `capacity` items are kept in memory; evicted items are lost
+    unless `spill` is set, in which case every item is also appended to a
+    temporary file and located through checkpoints taken every
+    `checkpoint_interval` items.
+
+    Args:
+        capacity: Maximum number of items kept in memory.
+        policy: Eviction policy, 'window' drops the oldest recorded item and
+            'lru' drops the least recently read one.
+        spill: Whether to keep every item replayable by spilling it to disk.
+        checkpoint_interval: Number of items between two spill file checkpoints.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        policy: str = 'window',
+        spill: bool = False,
+        checkpoint_interval: int = 256,
+    ):
+        if capacity < 1:
+            raise ValueError("Replay capacity must be a positive integer.")
+        if checkpoint_interval < 1:
+            raise ValueError("Checkpoint interval must be a positive integer.")
+        if policy not in REPLAY_POLICIES:
+            raise ValueError(f"Replay policy {policy} not supported")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.checkpoint_interval = checkpoint_interval
+
+        self._cache: OrderedDict = OrderedDict()
+        self._spill_file = TemporaryFile() if spill else None
+        self._checkpoints: Dict[int, int] = {}
+
+        # Index of the first recorded item, non-zero for sources resumed mid-way
+        self.start: int = 0
+
+        # Index of the next item the source produces
+        self.end: int = 0
+
+    def start_at(self, index: int):
+        """
+        Makes the next recorded item the one at `index`, for sources positioned
+        there before any item was recorded.
+        """
+        if self.end != self.start:
+            raise ValueError("Cannot move the start of a non-empty replay buffer.")
+
+        self.start = self.end = index
+
+    def record(self, item: object):
+        index = self.end
+        self.end += 1
+
+        self._cache[index] = item
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+        if self._spill_file is not None:
+            if index % self.checkpoint_interval == 0 or index == self.start:
+                self._checkpoints[index // self.checkpoint_interval] = (
+                    self._spill_file.tell()
+                )
+            pickle.dump(item, self._spill_file, pickle.HIGHEST_PROTOCOL)
+
+    def __contains__(self, index: int) -> bool:
+        if not self.start <= index < self.end:
+            return False
+
+        return self._spill_file is not None or index in self._cache
+
+    def can_replay_from(self, index: int) -> bool:
+        """
+        Checks whether every item from `index` up to the recorded end is available.
+        """
+        if not self.start <= index <= self.end:
+            return False
+        if index == self.end or self._spill_file is not None:
+            return True
+        if self.end - index > len(self._cache):
+            return False
+
+        return all(position in self._cache for position in range(index, self.end))
+
+    def get(self, index: int) -> object:
+        if index in self._cache:
+            if self.policy == 'lru':
+                self._cache.move_to_end(index)
+            return self._cache[index]
+
+        if index not in self:
+            raise ValueError(f"Item at step {index} is no longer buffered.")
+
+        item = self._load(index)
+
+        # Reloaded items are cached like freshly recorded ones
+        self._cache[index] = item
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+        return item
+
+    def _load(self, index: int) -> object:
+        checkpoint = index // self.checkpoint_interval
+        offset = index - max(checkpoint * self.checkpoint_interval, self.start)
+        write_position = self._spill_file.tell()
+
+        try:
+            self._spill_file.seek(self._checkpoints[checkpoint])
+            for _ in range(offset):
+                pickle.load(self._spill_file)
+            return pickle.load(self._spill_file)
+        finally:
+            self._spill_file.seek(write_position)
+
+    def fetch(self, index: int, iterator: Iterator) -> object:
+        """
+        Returns the item at `index`, replaying it if already recorded and pulling
+        (and recording) it from the iterator otherwise.
+        """
+        if index < self.end:
+            return self.get(index)
+
+        item = next(iterator)
+        self.record(item)
+
+        return item
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
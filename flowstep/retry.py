@@ -0,0 +1,138 @@
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import count
+from random import uniform
+from time import monotonic, sleep
+from typing import Callable, Iterator, List, NamedTuple, Tuple, Type
+
+GIVE_UP_ACTIONS = ['skip', 'pause', 'stop']
+
+
+class DeadLetter(NamedTuple):
+    """
+    An item that kept failing after all its retries.
+    """
+
+    index: int
+    item: object
+    error: BaseException
+    attempts: int
+
+
+def backoff_delay(
+    attempt: int, backoff: float, jitter: float, max_backoff: float
+) -> float:
+    """
+    Exponential backoff, doubling at each attempt, plus up to `jitter` of it at random.
+    """
+    delay = min(backoff * 2 ** (attempt - 1), max_backoff)
+    return delay + uniform(0, jitter * delay)
+
+
+def run_with_retries(
+    flow,
+    fn: Callable,
+    retries: int,
+    backoff: float,
+    jitter: float,
+    max_backoff: float,
+    on_give_up: str,
+    workers: int,
+    retry_on: Tuple[Type[BaseException], ...],
+    dead_letters: List[DeadLetter],
+) -> Iterator[Tuple[int, object]]:
+    """
+    Applies `fn` to the items of a flow, retrying failures with backoff.
+
+    Failed items wait in a delay queue ordered by their next attempt time, so they
+    hold no worker while backing off and healthy items keep going. Items failing
+    `retries` more times are appended to `dead_letters` and the flow is skipped
+    ahead, paused or stopped according to `on_give_up`.
+
+    Yields:
+        `(index, result)` pairs, in completion order.
+    """
+    if retries < 0:
+        raise ValueError("Number of retries must be a non-negative integer.")
+    if on_give_up not in GIVE_UP_ACTIONS:
+        raise ValueError(f"Give up action {on_give_up} not supported")
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    in_flight = {}
+    delayed: list = []
+    sequence = count()
+    exhausted = False
+
+    try:
+        while True:
+            now = monotonic()
+
+            # Stopping gives up on the items still backing off
+            if flow.stopped:
+                while delayed:
+                    _, _, index, item, attempt, error = heapq.heappop(delayed)
+                    dead_letters.append(DeadLetter(index, item, error, attempt - 1))
+
+            # Retries whose backoff expired go first
+            while delayed and delayed[0][0] <= now and len(in_flight) < workers:
+                _, _, index, item, attempt, _ = heapq.heappop(delayed)
+                in_flight[pool.submit(fn, item)] = (index, item, attempt)
+
+            while not exhausted and len(in_flight) < workers:
+                try:
+                    index, item = next(flow)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(fn, item)] = (index, item, 1)
+
+            timeout = max(delayed[0][0] - monotonic(), 0) if delayed else None
+
+            if not in_flight:
+                if not delayed:
+                    return
+
+                # Only backing off items are left
+                sleep(timeout)
+                continue
+
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, item, attempt = in_flight.pop(future)
+                error = future.exception()
+
+                if error is None:
+                    yield index, future.result()
+                    continue
+
+                if not isinstance(error, retry_on):
+                    raise error
+
+                if attempt <= retries and not flow.stopped:
+                    delay = backoff_delay(attempt, backoff, jitter, max_backoff)
+                    heapq.heappush(
+                        delayed,
+                        (
+                            monotonic() + delay,
+                            next(sequence),
+                            index,
+                            item,
+                            attempt + 1,
+                            error,
+                        ),
+                    )
+                    continue
+
+                dead_letters.append(DeadLetter(index, item, error, attempt))
+
+                message = f"Gave up on item {index} after {attempt} attempts: {error}"
+                if on_give_up == 'pause':
+                    flow.pause(message)
+                elif on_give_up == 'stop':
+                    flow.stop(message)
+
+    finally:
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=True)
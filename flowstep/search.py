@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+def _identity(item: object) -> object:
+    return item
+
+
+class SearchIndex:
+    """
+    Maps search keys to the steps of the items carrying them.
+
+    Unsorted sources use a hash index from keys to their first step, and sources
+    declared sorted by key use binary search. Sequential sources are indexed as
+    the flow hands items out, so only items already read can be found. Sources
+    read by index are searched directly: sorted ones by bisecting the source
+    itself, the others by a single scan building the hash index on the first
+    miss. Either way, items the skip condition drops are never found, as with
+    sequential sources.
+
+    Args:
+        key: Optional function extracting the search key of an item.
+        sorted: Whether the source is sorted by key.
+        view: Optional random-access view of the source.
+        skip_condition: Optional skip condition of the flow, applied to the view.
+    """
+
+    def __init__(
+        self,
+        key: Callable = None,
+        sorted: bool = False,
+        view: Sequence = None,
+        skip_condition: Callable = None,
+    ):
+        self.key = _identity if key is None else key
+        self.sorted = sorted
+        self.view = view
+        self.skip_condition = skip_condition
+
+        self._positions: Dict = {}
+        self._keys: List = []
+        self._steps: List[int] = []
+        self._complete = False
+
+    def record(self, step: int, item: object):
+        value = self.key(item)
+
+        if self.sorted:
+            # Replayed items are already recorded
+            if not self._steps or step > self._steps[-1]:
+                self._keys.append(value)
+                self._steps.append(step)
+            return
+
+        known = self._positions.get(value)
+        if known is None or step < known:
+            self._positions[value] = step
+
+    def find(self, value: object) -> Optional[int]:
+        """
+        Returns the first step holding an item with the given key, None if unknown.
+        """
+        if self.sorted:
+            return self._bisect(value)
+
+        step = self._positions.get(value)
+        if step is None and self.view is not None and not self._complete:
+            self._scan()
+            step = self._positions.get(value)
+
+        return step
+
+    def _bisect(self, value: object) -> Optional[int]:
+        if self.view is None:
+            position = bisect_left(self._keys, value)
+            if position < len(self._keys) and self._keys[position] == value:
+                return self._steps[position]
+            return None
+
+        low, high = 0, len(self.view)
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(self.view[middle]) < value:
+                low = middle + 1
+            else:
+                high = middle
+
+        # The first item with the key may be skipped, but not the next ones
+        for step in range(low, len(self.view)):
+            item = self.view[step]
+            if self.key(item) != value:
+                return None
+            if self.skip_condition is None or not self.skip_condition(item):
+                return step
+
+        return None
+
+    def _scan(self):
+        skip_condition = self.skip_condition
+        for step in range(len(self.view)):
+            item = self.view[step]
+            if skip_condition is None or not skip_condition(item):
+                self._positions.setdefault(self.key(item), step)
+
+        self._complete = True
@@ -0,0 +1,230 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from .defaults import Condition, default_skip_condition
+from .flow import Flow
+from .utils import sliceable_view
+
+# Number of items a worker processes between two checks of the shared flags
+CONTROL_INTERVAL = 64
+
+# Shared state of the worker processes, set by the pool initializer
+_controls = {}
+
+# Shared memory attached by a worker, by name. It is never closed explicitly:
+# unmapping it while items or results still view it would leave them dangling,
+# and the mapping goes away with the worker when the pool shuts down.
+_attached = {}
+
+
+def _init_worker(stopped, running, counter):
+    _controls.update(stopped=stopped, running=running, counter=counter)
+
+
+def _attach(source):
+    """
+    Rebuilds a shard's source in a worker, attaching NumPy data in shared memory.
+    """
+    if not isinstance(source, SharedArray):
+        return source
+
+    if source.name not in _attached:
+        import numpy as np
+        from multiprocessing import shared_memory
+
+        memory = shared_memory.SharedMemory(name=source.name)
+        array = np.ndarray(source.shape, dtype=source.dtype, buffer=memory.buf)
+        _attached[source.name] = (memory, array)
+
+    return _attached[source.name][1][source.start : source.stop]
+
+
+def _run_shard(
+    start: int, source, fn: Callable, skip_condition: Condition
+) -> List[Tuple[int, object]]:
+    stopped, running = _controls["stopped"], _controls["running"]
+    counter = _controls["counter"]
+
+    results = []
+    pending = 0
+
+    for index, item in Flow(_attach(source), skip_condition=skip_condition):
+        if pending == CONTROL_INTERVAL:
+            with counter.get_lock():
+                counter.value += pending
+            pending = 0
+
+            running.wait()
+            if stopped.is_set():
+                break
+
+        results.append((start + index, fn(item)))
+        pending += 1
+
+    with counter.get_lock():
+        counter.value += pending
+
+    return results
+
+
+class SharedArray:
+    """
+    Picklable reference to a range of a NumPy array held in shared memory.
+    """
+
+    def __init__(self, name: str, shape: tuple, dtype: object, start: int, stop: int):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.start = start
+        self.stop = stop
+
+
+class ShardedFlow:
+    """
+    Runs a function over an index-addressable source on several processes.
+
+    The source is split into contiguous ranges, each processed by a `Flow` in a
+    worker process. NumPy arrays are copied once into shared memory, so shards
+    are not pickled. Pause, resume and stop are shared with the workers, which
+    check them every `CONTROL_INTERVAL` items and add to a global counter.
+
+    Args:
+        iterable: The sliceable source, see `sliceable_view`.
+        workers: Number of worker processes, the CPU count by default.
+        shards: Number of ranges, four per worker by default.
+        skip_condition: Optional picklable function returning True to skip an item.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable,
+        workers: int = None,
+        shards: int = None,
+        skip_condition: Condition = default_skip_condition,
+    ):
+        view = sliceable_view(iterable)
+        if view is None:
+            raise ValueError("Sharded flows require an index-addressable source.")
+
+        self.iterable = iterable
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = max(1, shards or 4 * self.workers)
+        self.total = len(view)
+        self._view = view
+        self._skip_condition = skip_condition
+
+        context = multiprocessing.get_context()
+        self._context = context
+        self._stopped = context.Event()
+        self._running = context.Event()
+        self._running.set()
+        self._counter = context.Value('q', 0)
+
+    @property
+    def counter(self) -> int:
+        """
+        Number of items processed by all workers so far.
+        """
+        return self._counter.value
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._running.set()
+
+    def _ranges(self) -> List[Tuple[int, int]]:
+        size, extra = divmod(self.total, self.shards)
+        ranges, start = [], 0
+
+        for shard in range(self.shards):
+            stop = start + size + (shard < extra)
+            if stop > start:
+                ranges.append((start, stop))
+            start = stop
+
+        return ranges
+
+    def _shared_memory(self):
+        # Object arrays hold pointers, meaningless in other processes
+        dtype = getattr(self.iterable, "dtype", None)
+        if getattr(dtype, "hasobject", True):
+            return None
+
+        import numpy as np
+        from multiprocessing import shared_memory
+
+        if not isinstance(self.iterable, np.ndarray):
+            return None
+
+        array = self.iterable
+        memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, array.dtype, buffer=memory.buf)
+        shared[...] = array
+        del shared
+
+        return memory
+
+    def map(self, fn: Callable, ordered: bool = True) -> Iterator[Tuple[int, object]]:
+        """
+        Applies a picklable function to every item, yielding `(index, result)` pairs.
+
+        Args:
+            fn: The function to apply.
+            ordered: Whether to yield results in index order or shard by shard as
+                they complete.
+        """
+        memory = self._shared_memory()
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._stopped, self._running, self._counter),
+        )
+
+        futures = []
+        try:
+            for start, stop in self._ranges():
+                source = (
+                    self._view[start:stop]
+                    if memory is None
+                    else SharedArray(
+                        memory.name,
+                        self.iterable.shape,
+                        self.iterable.dtype,
+                        start,
+                        stop,
+                    )
+                )
+                futures.append(
+                    pool.submit(_run_shard, start, source, fn, self._skip_condition)
+                )
+
+            for future in futures if ordered else as_completed(futures):
+                if self.stopped:
+                    break
+                yield from future.result()
+
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+            if memory is not None:
+                memory.close()
+                memory.unlink()
@@ -0,0 +1,408 @@
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from queue import Empty, Queue
+from threading import BoundedSemaphore
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from .utils import atomic_write, register_random_access
+
+FILE_FORMATS = ['lines', 'fixed', 'jsonl']
+
+# Bumped whenever the layout of cached offset indexes changes
+INDEX_VERSION = 1
+
+_CARRIAGE_RETURN = ord('\r')
+
+
+def scan_lines(buffer, size: int, skip_blank: bool = False) -> Tuple[array, array]:
+    """
+    Finds the start and end offsets of the lines of a buffer, newlines excluded.
+
+    Args:
+        buffer: A bytes-like object with a `find` method, such as an mmap.
+        size: Number of bytes to scan.
+        skip_blank: Whether to leave empty lines out of the index.
+    """
+    starts, ends = array('q'), array('q')
+    find = buffer.find
+    start = 0
+
+    while start < size:
+        newline = find(b'\n', start)
+        stop = size if newline < 0 else newline
+        end = (
+            stop - 1 if stop > start and buffer[stop - 1] == _CARRIAGE_RETURN else stop
+        )
+
+        if end > start or not skip_blank:
+            starts.append(start)
+            ends.append(end)
+
+        start = stop + 1
+
+    return starts, ends
+
+
+def index_path(path: str, format: str) -> str:
+    return f"{path}.{format}.idx"
+
+
+def load_index(path: str, stat: os.stat_result) -> Union[Tuple[array, array], None]:
+    """
+    Reads a cached offset index, None if missing or stale.
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    values = array('q')
+    try:
+        values.frombytes(data)
+    except ValueError:
+        return None
+
+    header = [INDEX_VERSION, stat.st_size, stat.st_mtime_ns]
+    if len(values) < 4 or list(values[:3]) != header:
+        return None
+
+    count = values[3]
+    if len(values) != 4 + 2 * count:
+        return None
+
+    return values[4 : 4 + count], values[4 + count :]
+
+
+def save_index(path: str, stat: os.stat_result, starts: array, ends: array):
+    values = array('q', [INDEX_VERSION, stat.st_size, stat.st_mtime_ns, len(starts)])
+    values.extend(starts)
+    values.extend(ends)
+
+    atomic_write(path, values.tobytes())
+
+
+@register_random_access
+class MappedFile:
+    """
+    Record-oriented, zero-copy view of a memory-mapped file.
+
+    Records are memoryview slices of the mapping, nothing is copied nor decoded.
+    Line-delimited files are scanned once for record boundaries, and the offset
+    index is cached next to the file, keyed by its size and modification time.
+    Fixed-size records need no index. Indexing a record costs O(1) either way.
+
+    Args:
+        path: Path of the file.
+        format: Either 'lines', 'fixed' or 'jsonl'. Lines exclude their newline,
+            and JSON lines also leave blank lines out.
+        record_size: Number of bytes per record, required by the 'fixed' format.
+        cache: Whether to read and write the offset index cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str = 'lines',
+        record_size: int = None,
+        cache: bool = True,
+    ):
+        if format not in FILE_FORMATS:
+            raise ValueError(f"File format {format} not supported")
+        if format == 'fixed' and (record_size is None or record_size < 1):
+            raise ValueError("Fixed-size records require a positive record size.")
+
+        self.path = path
+        self.format = format
+        self.record_size = record_size
+
+        with open(path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            # Empty files cannot be mapped
+            self._mmap = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if stat.st_size
+                else None
+            )
+
+        self.size = stat.st_size
+        self._memory = memoryview(b'' if self._mmap is None else self._mmap)
+
+        self._starts: array = None
+        self._ends: array = None
+
+        if format == 'fixed':
+            if self.size % record_size:
+                raise ValueError("File size is not a multiple of the record size.")
+            self._length = self.size // record_size
+            return
+
+        cached = load_index(index_path(path, format), stat) if cache else None
+        if cached is None:
+            buffer = b'' if self._mmap is None else self._mmap
+            cached = scan_lines(buffer, self.size, skip_blank=format == 'jsonl')
+            if cache:
+                # Read-only locations keep the index in memory only
+                try:
+                    save_index(index_path(path, format), stat, *cached)
+                except OSError:
+                    pass
+
+        self._starts, self._ends = cached
+        self._length = len(self._starts)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _record(self, index: int) -> memoryview:
+        if self._starts is None:
+            start = index * self.record_size
+            return self._memory[start : start + self.record_size]
+
+        return self._memory[self._starts[index] : self._ends[index]]
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[memoryview, List[memoryview]]:
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Record index out of range.")
+
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for index in range(self._length):
+            yield self._record(index)
+
+    def close(self):
+        """
+        Unmaps the file. Records still referenced keep the mapping alive until freed.
+        """
+        self._memory.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Hands out up to `size` database connections, reusing released ones.
+
+    Args:
+        connect: Function opening a DB-API connection.
+        size: Maximum number of connections in use at once.
+    """
+
+    def __init__(self, connect: Callable, size: int = 4):
+        if size < 1:
+            raise ValueError("Pool size must be a positive integer.")
+
+        self._connect = connect
+        self._idle: Queue = Queue()
+        self._slots = BoundedSemaphore(size)
+        self._connections: list = []
+
+    def acquire(self):
+        self._slots.acquire()
+
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        try:
+            connection = self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._connections.append(connection)
+        return connection
+
+    def release(self, connection):
+        self._idle.put(connection)
+        self._slots.release()
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+
+
+class QuerySource:
+    """
+    Streams the rows of a query in `fetchmany` batches.
+
+    The source is its own iterator and provides the `seek(offset)` hook used by
+    flows to seek and restore. Without a key, seeking runs the query again and
+    discards the rows before the offset. With a `key` column giving a total
+    order, rows are read by keyset pagination and the last key of each batch is
+    remembered, so seeking resumes the query right after the closest batch
+    boundary instead of reading the earlier rows again. The boundaries are saved
+    in flow checkpoints, so restored flows resume the query by key as well.
+
+    Args:
+        connect: Function opening a DB-API connection, or a `ConnectionPool`.
+        sql: The query.
+        params: Query parameters, a sequence when paginating by key.
+        batch_size: Number of rows fetched at once.
+        key: Optional name of a unique column to order and paginate by.
+        placeholder: Parameter placeholder of the driver, '?' for sqlite3.
+    """
+
+    def __init__(
+        self,
+        connect: Union[Callable, ConnectionPool],
+        sql: str,
+        params: Sequence = (),
+        batch_size: int = 1000,
+        key: str = None,
+        placeholder: str = '?',
+    ):
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+        if key is not None and isinstance(params, Mapping):
+            raise ValueError("Keyset pagination requires positional parameters.")
+
+        self._owns_pool = not isinstance(connect, ConnectionPool)
+        self.pool = ConnectionPool(connect) if self._owns_pool else connect
+        self.sql = sql
+        self.params = params
+        self.batch_size = batch_size
+        self.key = key
+        self.placeholder = placeholder
+
+        self._connection = None
+        self._cursor = None
+        self._key_index: int = None
+        self._rows: list = []
+        self._position = 0
+        self._offset = 0
+        self._exhausted = False
+
+        # Offsets of the batch boundaries and the key of the row before each
+        self._boundaries: List[int] = []
+        self._boundary_keys: list = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._position == len(self._rows):
+            self._fetch()
+
+        row = self._rows[self._position]
+        self._position += 1
+        self._offset += 1
+
+        return row
+
+    def _execute(self, after: object = None):
+        self._connection = self.pool.acquire()
+        self._cursor = self._connection.cursor()
+        self._exhausted = False
+
+        if self.key is None:
+            self._cursor.execute(self.sql, self.params)
+            return
+
+        query = f"SELECT * FROM ({self.sql}) AS page"
+        params = list(self.params)
+        if after is not None:
+            query += f" WHERE {self.key} > {self.placeholder}"
+            params.append(after)
+
+        self._cursor.execute(f"{query} ORDER BY {self.key}", params)
+
+        names = [column[0] for column in self._cursor.description]
+        self._key_index = names.index(self.key)
+
+    def _fetch(self):
+        if self._cursor is None and not self._exhausted:
+            self._execute()
+
+        self._rows = (
+            [] if self._cursor is None else self._cursor.fetchmany(self.batch_size)
+        )
+        self._position = 0
+
+        if not self._rows:
+            self._release()
+            self._exhausted = True
+            raise StopIteration
+
+        end = self._offset + len(self._rows)
+        if self.key is not None and (
+            not self._boundaries or end > self._boundaries[-1]
+        ):
+            self._boundaries.append(end)
+            self._boundary_keys.append(self._rows[-1][self._key_index])
+
+    def _release(self):
+        if self._cursor is not None:
+            self._cursor.close()
+            self.pool.release(self._connection)
+        self._cursor = None
+        self._connection = None
+
+    def state(self) -> Dict:
+        """
+        Returns the batch boundaries learned so far, saved in flow checkpoints.
+
+        Keys are stored as they are, so they must be JSON serializable.
+        """
+        return {"boundaries": list(self._boundaries), "keys": list(self._boundary_keys)}
+
+    def restore_state(self, state: Dict):
+        """
+        Restores the batch boundaries of a checkpoint, so that seeking resumes
+        the query by key instead of reading the earlier rows again.
+        """
+        self._boundaries = list(state["boundaries"])
+        self._boundary_keys = list(state["keys"])
+
+    def seek(self, offset: int):
+        """
+        Positions the source so that the next row read is the one at `offset`.
+        """
+        self._release()
+        self._rows, self._position = [], 0
+
+        boundary = bisect_right(self._boundaries, offset) - 1
+        if boundary < 0:
+            self._offset = 0
+            self._execute()
+        else:
+            self._offset = self._boundaries[boundary]
+            self._execute(self._boundary_keys[boundary])
+
+        while self._offset < offset:
+            if self._position == len(self._rows):
+                try:
+                    self._fetch()
+                except StopIteration:
+                    return
+
+            skipped = min(offset - self._offset, len(self._rows) - self._position)
+            self._position += skipped
+            self._offset += skipped
+
+    def close(self):
+        self._release()
+        if self._owns_pool:
+            self.pool.close()
@@ -1,4 +1,12 @@
-from typing import Iterable
+import operator
+import os
+import sys
+from array import array
+from io import IOBase
+from typing import Iterable, Optional, Sequence, Type, Union
+
+# Types indexed in O(1), read by position instead of being iterated
+RANDOM_ACCESS_TYPES = (list, tuple, range, str, bytes, bytearray, array, memoryview)
 
 
 def is_sliceable(obj: object) -> bool:
@@ -12,3 +20,126 @@ def is_sliceable(obj: object) -> bool:
         True if the object is an iterable that supports slicing, False otherwise.
     """
     return isinstance(obj, Iterable) and hasattr(obj, "__getitem__")
+
+
+def length_hint(obj: object) -> Optional[int]:
+    """
+    Returns the length of an iterable without consuming it.
+
+    Uses `__len__` when available and falls back to `operator.length_hint`.
+
+    Args:
+        obj: The iterable to measure.
+
+    Returns:
+        The (possibly estimated) length, or None if it cannot be known upfront.
+    """
+    try:
+        return len(obj)
+    except TypeError:
+        pass
+
+    hint = operator.length_hint(obj, -1)
+    return hint if hint >= 0 else None
+
+
+def register_random_access(cls: Type) -> Type:
+    """
+    Marks a class as indexed in O(1), so flows read its instances by position.
+    """
+    global RANDOM_ACCESS_TYPES
+    RANDOM_ACCESS_TYPES = (*RANDOM_ACCESS_TYPES, cls)
+
+    return cls
+
+
+def positional_view(obj: object) -> Optional[Sequence]:
+    """
+    Returns an iterable indexed in O(1) by position, for flows to read by index.
+
+    Only built-in sequences, buffers, NumPy arrays and registered classes
+    qualify. Other indexable objects, such as deques or pandas objects, are
+    cheaper to iterate than to index item by item.
+
+    Args:
+        obj: The object to inspect.
+
+    Returns:
+        The object itself, or None if it is not indexed in O(1).
+    """
+    if isinstance(obj, RANDOM_ACCESS_TYPES):
+        return obj
+
+    # Arrays only exist once NumPy is imported
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(obj, numpy.ndarray):
+        return obj
+
+    return None
+
+
+def sliceable_view(obj: object) -> Optional[Sequence]:
+    """
+    Returns a view of an iterable supporting `len` and positional slicing.
+
+    Extends `positional_view` to pandas objects, accessed through `iloc` so that
+    integer keys are positions, for callers reading whole chunks at once.
+
+    Args:
+        obj: The object to inspect.
+
+    Returns:
+        The sliceable view, or None if the object cannot be sliced by position.
+    """
+    view = positional_view(obj)
+    if view is None and hasattr(obj, "iloc") and hasattr(obj, "__len__"):
+        return ILocView(obj)
+
+    return view
+
+
+def has_seek_hook(source: object) -> bool:
+    """
+    Checks if a source can position itself on an item offset through `seek(offset)`.
+
+    File objects are excluded, their `seek` takes byte offsets.
+    """
+    return callable(getattr(source, "seek", None)) and not isinstance(source, IOBase)
+
+
+class ILocView:
+    """
+    Positional view of a pandas object, indexed through `iloc` and sized by `len`.
+    """
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj: object):
+        self.obj = obj
+
+    def __len__(self) -> int:
+        return len(self.obj)
+
+    def __getitem__(self, index):
+        return self.obj.iloc[index]
+
+
+def atomic_write(path: str, text: Union[str, bytes]):
+    """
+    Writes a file atomically: readers see either the previous or the new content.
+
+    Args:
+        path: Path of the file to write.
+        text: Content of the file, bytes are written in binary mode.
+    """
+    from tempfile import NamedTemporaryFile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    mode = 'wb' if isinstance(text, bytes) else 'w'
+
+    with NamedTemporaryFile(mode, dir=directory, suffix='.tmp', delete=False) as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(file.name, path)
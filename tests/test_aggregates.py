@@ -0,0 +1,199 @@
+import random
+import statistics
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.aggregates import (
+    Aggregates,
+    HyperLogLog,
+    QuantileSketch,
+    RunningStats,
+    stable_hash,
+)
+
+
+class TestRunningStats:
+    def test_items_and_batches_agree(self):
+        values = [random.uniform(-10, 10) for _ in range(1000)]
+
+        single = RunningStats()
+        for value in values:
+            single.update(value)
+
+        batched = RunningStats()
+        batched.update_batch(values[:300])
+        batched.update_batch(values[300:])
+
+        for stats in (single, batched):
+            assert stats.count == 1000
+            assert stats.mean == pytest.approx(statistics.fmean(values))
+            assert stats.variance == pytest.approx(statistics.pvariance(values))
+            assert (stats.min, stats.max) == (min(values), max(values))
+
+    def test_merge(self):
+        left, right = RunningStats(), RunningStats()
+        left.update_batch([1, 2, 3])
+        right.update_batch([4, 5])
+
+        merged = left.merge(right)
+        assert (merged.count, merged.sum, merged.mean) == (5, 15, 3.0)
+        assert merged.variance == pytest.approx(2.0)
+
+    def test_numpy_batch(self):
+        np = pytest.importorskip("numpy")
+
+        stats = RunningStats()
+        stats.update_batch(np.arange(10))
+        assert (stats.count, stats.sum, stats.min, stats.max) == (10, 45, 0, 9)
+        assert stats.variance == pytest.approx(8.25)
+
+    def test_empty(self):
+        summary = RunningStats().summary()
+        assert summary["count"] == 0 and summary["min"] is None
+
+
+class TestQuantileSketch:
+    def test_quantiles_within_error(self):
+        values = list(range(100_000))
+        random.shuffle(values)
+
+        sketch = QuantileSketch(k=200)
+        sketch.update_batch(values)
+
+        assert sketch.count == 100_000
+        assert sketch._size() < 1000
+        for q in (0.1, 0.5, 0.9):
+            assert abs(sketch.quantile(q) - q * 100_000) < 3_000
+
+    def test_merge(self):
+        left, right = QuantileSketch(), QuantileSketch()
+        for value in range(5000):
+            (left if value % 2 else right).update(value)
+
+        merged = left.merge(right)
+        assert merged.count == 5000
+        assert abs(merged.quantile(0.5) - 2500) < 250
+
+    def test_merge_requires_same_capacity(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(k=100).merge(QuantileSketch(k=200))
+
+    def test_empty(self):
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestHyperLogLog:
+    def test_estimate(self):
+        sketch = HyperLogLog(precision=12)
+        sketch.update_batch(f"item-{value % 20_000}" for value in range(50_000))
+
+        assert sketch.count() == pytest.approx(20_000, rel=0.05)
+
+    def test_small_cardinality(self):
+        sketch = HyperLogLog()
+        sketch.update_batch([1, 2, 3, 2, 1])
+
+        assert round(sketch.count()) == 3
+
+    def test_numpy_batches_match_items(self):
+        np = pytest.importorskip("numpy")
+
+        values = np.arange(-5000, 5000, dtype=np.int64)
+        vectorized, single = HyperLogLog(), HyperLogLog()
+        vectorized.update_batch(values)
+        for value in values.tolist():
+            single.update(value)
+
+        assert vectorized._registers == single._registers
+
+    def test_pandas_batches_match_numpy(self):
+        np = pytest.importorskip("numpy")
+        pd = pytest.importorskip("pandas")
+
+        values = np.arange(-5000, 5000, dtype=np.int64)
+        series, array = HyperLogLog(), HyperLogLog()
+        series.update_batch(pd.Series(values))
+        array.update_batch(values)
+
+        assert series._registers == array._registers
+
+    def test_merge(self):
+        left, right = HyperLogLog(), HyperLogLog()
+        left.update_batch(range(0, 6000))
+        right.update_batch(range(4000, 10_000))
+
+        assert left.merge(right).count() == pytest.approx(10_000, rel=0.05)
+
+    def test_stable_hash(self):
+        assert stable_hash("flow") == stable_hash("flow")
+        assert stable_hash(1) != stable_hash(2)
+
+
+class TestFlowAggregate:
+    def test_single_pass(self):
+        flow = Flow(range(100), skip_condition=lambda item: item >= 50)
+        aggregates = flow.aggregate(buffer_size=16)
+        list(flow)
+
+        summary = aggregates.summary()
+        assert summary["count"] == 50
+        assert summary["mean"] == 24.5
+        assert summary["quantiles"][0.5] in range(20, 30)
+        assert round(summary["distinct"]) == 50
+
+    def test_key(self):
+        flow = Flow([{"v": 1}, {"v": 3}])
+        aggregates = flow.aggregate(
+            key=lambda item: item["v"], quantiles=False, distinct=False
+        )
+        list(flow)
+
+        assert aggregates.summary() == {
+            "count": 2,
+            "sum": 4,
+            "mean": 2.0,
+            "variance": 1.0,
+            "min": 1,
+            "max": 3,
+        }
+
+    def test_batches(self):
+        np = pytest.importorskip("numpy")
+
+        flow = Flow(np.arange(1000))
+        aggregates = flow.aggregate()
+        for _ in flow.batches(size=128, kind='view'):
+            pass
+
+        summary = aggregates.summary()
+        assert (summary["count"], summary["sum"]) == (1000, 499500)
+
+    def test_pandas_batches(self):
+        pd = pytest.importorskip("pandas")
+
+        flow = Flow(pd.Series(range(10)))
+        aggregates = flow.aggregate()
+        list(flow.batches(size=4))
+
+        summary = aggregates.summary()
+        assert (summary["count"], summary["sum"]) == (10, 45)
+        assert round(summary["distinct"]) == 10
+
+    def test_merge_flows(self):
+        left, right = Flow(range(0, 10)), Flow(range(10, 20))
+        aggregates = [flow.aggregate() for flow in (left, right)]
+        list(left), list(right)
+
+        merged = aggregates[0].merge(aggregates[1])
+        assert merged.summary()["sum"] == sum(range(20))
+
+    def test_merge_requires_same_sketches(self):
+        with pytest.raises(ValueError):
+            Aggregates(quantiles=False).merge(Aggregates(stats=False))
+
+    def test_disables_fast_path(self, iterable):
+        flow = Flow(iterable)
+        flow.aggregate()
+        assert not flow._fast
+
+        assert isinstance(flow._aggregates, Aggregates)
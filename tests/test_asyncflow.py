@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from flowstep.asyncflow import AsyncFlow
+
+
+async def agenerator(length: int = 5):
+    for item in range(length):
+        await asyncio.sleep(0)
+        yield item
+
+
+async def collect(flow):
+    return [pair async for pair in flow]
+
+
+class TestAsyncFlow:
+    def test_async_iterable(self):
+        flow = AsyncFlow(agenerator())
+
+        assert asyncio.run(collect(flow)) == [(i, i) for i in range(5)]
+        assert flow.total == 5
+
+    def test_sync_iterable(self):
+        flow = AsyncFlow([1, 2, 3])
+
+        assert flow.total == 3
+        assert asyncio.run(collect(flow)) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_async_skip_condition(self):
+        async def is_even(item):
+            await asyncio.sleep(0)
+            return item % 2 == 0
+
+        flow = AsyncFlow(agenerator(), skip_condition=is_even)
+        assert asyncio.run(collect(flow)) == [(1, 1), (3, 3)]
+
+    def test_pause_and_resume(self):
+        async def scenario():
+            flow = AsyncFlow(agenerator())
+            assert await flow.__anext__() == (0, 0)
+
+            flow.pause()
+            pending = asyncio.ensure_future(flow.__anext__())
+            await asyncio.sleep(0.01)
+
+            # The consumer waits without blocking the loop
+            assert not pending.done()
+            assert await flow.wait_resumed(timeout=0.01) is False
+
+            flow.resume()
+            return await pending
+
+        assert asyncio.run(scenario()) == (1, 1)
+
+    def test_skip_while_paused(self):
+        async def scenario():
+            flow = AsyncFlow(agenerator())
+            flow.pause()
+            pending = asyncio.ensure_future(flow.__anext__())
+            await asyncio.sleep(0)
+
+            flow.skip()
+            return await pending
+
+        assert asyncio.run(scenario()) == (1, 1)
+
+    def test_stop_while_paused(self):
+        async def scenario():
+            flow = AsyncFlow(agenerator())
+            flow.pause()
+            pending = asyncio.ensure_future(collect(flow))
+            await asyncio.sleep(0)
+
+            flow.stop()
+            return await pending
+
+        assert asyncio.run(scenario()) == []
+
+    def test_concurrent_consumers_with_prefetch(self):
+        async def consumer(flow, results):
+            async for pair in flow:
+                results.append(pair)
+                await asyncio.sleep(0)
+
+        async def scenario():
+            results = []
+            async with AsyncFlow(agenerator(20), prefetch=4) as flow:
+                await asyncio.gather(*(consumer(flow, results) for _ in range(3)))
+            return results
+
+        assert sorted(asyncio.run(scenario())) == [(i, i) for i in range(20)]
+
+    def test_prefetch_errors_are_raised(self):
+        def failing(item):
+            if item == 2:
+                raise ValueError("Condition failed")
+            return False
+
+        async def scenario(results):
+            async with AsyncFlow(range(5), skip_condition=failing, prefetch=2) as flow:
+                async for pair in flow:
+                    results.append(pair)
+
+        results = []
+        with pytest.raises(ValueError):
+            asyncio.run(asyncio.wait_for(scenario(results), 1))
+        assert results == [(0, 0), (1, 1)]
+
+    def test_constructed_outside_the_loop(self):
+        flow = AsyncFlow(agenerator())
+        flow.pause()
+
+        # Loop-bound primitives are only created once the flow runs
+        assert flow._AsyncFlow__running is None
+
+        async def scenario():
+            asyncio.get_running_loop().call_later(0.01, flow.resume)
+            first = await flow.__anext__()
+
+            flow.pause()
+            asyncio.get_running_loop().call_later(0.01, flow.resume)
+            return first, await flow.__anext__()
+
+        assert asyncio.run(scenario()) == ((0, 0), (1, 1))
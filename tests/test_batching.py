@@ -0,0 +1,154 @@
+import pytest
+from array import array
+
+from flowstep.flow import Flow
+from flowstep.batching import AdaptiveBatchSizer, MaskedChunks
+
+
+def odd_mask(chunk):
+    return [item % 2 == 1 for item in chunk]
+
+
+class TestMaskedChunks:
+    def test_list_source(self):
+        chunks = MaskedChunks(list(range(10)), odd_mask, 3)
+        assert list(chunks) == [0, 2, 4, 6, 8]
+        assert chunks.position == 10
+
+    def test_generator_source(self):
+        chunks = MaskedChunks((i for i in range(10)), odd_mask, 4)
+        assert list(chunks) == [0, 2, 4, 6, 8]
+
+    def test_fully_skipped_chunks(self):
+        chunks = MaskedChunks(range(10), lambda chunk: [item < 8 for item in chunk], 2)
+        assert list(chunks) == [8, 9]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            MaskedChunks([1, 2], odd_mask, 0)
+
+
+class TestFlowBatchSkip:
+    def test_original_indices(self):
+        source = array('i', range(10))
+        flow = Flow(source, batch_skip_condition=odd_mask, batch_size=4)
+
+        assert list(flow) == [(0, 0), (2, 2), (4, 4), (6, 6), (8, 8)]
+        assert flow._counter == 10
+
+    def test_calls_per_chunk(self):
+        calls = []
+
+        def condition(chunk):
+            calls.append(len(chunk))
+            return odd_mask(chunk)
+
+        flow = Flow(range(10), batch_skip_condition=condition, batch_size=4)
+        list(flow)
+
+        assert calls == [4, 4, 2]
+
+    def test_unknown_total(self):
+        flow = Flow((i for i in range(5)), batch_skip_condition=odd_mask)
+        list(flow)
+
+        assert flow.total == 5
+
+    def test_combined_with_skip_condition(self):
+        flow = Flow(
+            range(10),
+            skip_condition=lambda item: item > 4,
+            batch_skip_condition=odd_mask,
+        )
+        assert list(flow) == [(0, 0), (2, 2), (4, 4)]
+
+    def test_numpy_source(self):
+        np = pytest.importorskip("numpy")
+
+        source = np.arange(10)
+        flow = Flow(source, batch_skip_condition=lambda chunk: chunk % 3 != 0)
+
+        assert [index for index, item in flow] == [0, 3, 6, 9]
+
+
+class TestFlowBatches:
+    def test_list_batches(self):
+        flow = Flow(range(10))
+        assert list(flow.batches(4)) == [
+            (0, [0, 1, 2, 3]),
+            (4, [4, 5, 6, 7]),
+            (8, [8, 9]),
+        ]
+
+    def test_tuple_batches_from_generator(self):
+        flow = Flow((i for i in range(5)))
+
+        assert list(flow.batches(2, kind='tuple')) == [
+            (0, (0, 1)),
+            (2, (2, 3)),
+            (4, (4,)),
+        ]
+        assert flow.total == 5
+
+    def test_view_batches(self):
+        source = array('i', range(6))
+        batches = list(Flow(source).batches(4, kind='view'))
+
+        assert isinstance(batches[0][1], memoryview)
+        assert [(start, view.tolist()) for start, view in batches] == [
+            (0, [0, 1, 2, 3]),
+            (4, [4, 5]),
+        ]
+
+    def test_numpy_view_batches(self):
+        np = pytest.importorskip("numpy")
+
+        source = np.arange(6)
+        start, batch = next(Flow(source).batches(4, kind='view'))
+
+        assert batch.base is source
+
+    def test_view_requires_random_access(self):
+        with pytest.raises(ValueError):
+            Flow(i for i in range(3)).batches(kind='view')
+
+    def test_skip_condition_filters_items(self):
+        flow = Flow(range(6), skip_condition=lambda item: item % 2 == 0)
+        assert list(flow.batches(3)) == [(0, [1]), (3, [3, 5])]
+
+    def test_skip_drops_next_batch(self):
+        flow = Flow(range(6))
+        batches = flow.batches(2)
+
+        assert next(batches) == (0, [0, 1])
+        flow.skip()
+        assert next(batches) == (4, [4, 5])
+
+    def test_stop(self):
+        flow = Flow(range(6))
+        batches = flow.batches(2)
+
+        next(batches)
+        flow.stop()
+        assert list(batches) == []
+
+    def test_replay_source(self):
+        flow = Flow((i for i in range(5)), replay=8)
+        assert list(flow.batches(3)) == [(0, [0, 1, 2]), (3, [3, 4])]
+
+    def test_adaptive_batches(self):
+        flow = Flow(range(10_000))
+        sizes = [
+            len(batch) for _, batch in flow.batches(1, target_latency=1.0, max_size=64)
+        ]
+
+        # Fast consumers grow batches up to the upper bound
+        assert sizes[:4] == [1, 2, 4, 8]
+        assert max(sizes) == 64
+        assert sum(sizes) == 10_000
+
+    def test_adaptive_sizer_shrinks(self):
+        sizer = AdaptiveBatchSizer(100, target_latency=0.1, max_size=1000)
+
+        assert sizer.update(1.0) == 50
+        assert sizer.update(0.1) == 50
@@ -0,0 +1,152 @@
+import threading
+import time
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.branching import Router
+
+
+def consume(flow, results: list, delay: float = 0.0):
+    for _, item in flow:
+        time.sleep(delay)
+        results.append(item)
+
+
+class TestTee:
+    def test_lockstep(self):
+        left, right = Flow(range(5)).tee(2, buffer_size=1)
+
+        pairs = [(next(left)[1], next(right)[1]) for _ in range(5)]
+        assert pairs == [(i, i) for i in range(5)]
+        assert left.total == 5
+
+        with pytest.raises(StopIteration):
+            next(left)
+
+    def test_reads_source_once_and_shares_items(self):
+        reads = []
+
+        def source():
+            for item in range(3):
+                reads.append(item)
+                yield [item]
+
+        left, right = Flow(source()).tee(2)
+        left_items = [item for _, item in left]
+        right_items = [item for _, item in right]
+
+        assert reads == [0, 1, 2]
+        assert all(a is b for a, b in zip(left_items, right_items))
+
+    def test_backpressure(self):
+        reads = []
+
+        def source():
+            for item in range(100):
+                reads.append(item)
+                yield item
+
+        fast, slow = Flow(source()).tee(2, buffer_size=4)
+        fast_results, slow_results = [], []
+        threads = [
+            threading.Thread(target=consume, args=(fast, fast_results)),
+            threading.Thread(target=consume, args=(slow, slow_results, 0.001)),
+        ]
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.01)
+        # The fast branch stays at most one buffer ahead of the slow one
+        assert len(reads) - len(slow_results) <= 6
+
+        for thread in threads:
+            thread.join()
+        assert fast_results == slow_results == list(range(100))
+
+    def test_single_thread_read_ahead_raises(self):
+        left, right = Flow(range(3000)).tee(2, reader_timeout=0.01)
+
+        with pytest.raises(RuntimeError):
+            list(left)
+
+        # Nothing is lost, the other branch catches up and unblocks the first
+        assert next(right) == (0, 0)
+        assert next(left) == (1024, 1024)
+
+    def test_read_ahead_raises_with_unrelated_threads(self):
+        idle = threading.Event()
+        thread = threading.Thread(target=idle.wait, daemon=True)
+        thread.start()
+
+        try:
+            left, right = Flow(range(3000)).tee(2)
+            with pytest.raises(RuntimeError):
+                list(left)
+
+            # A branch last read by the blocked thread itself cannot drain either
+            left, right = Flow(range(3000)).tee(2, buffer_size=4)
+            next(right)
+            with pytest.raises(RuntimeError):
+                list(left)
+        finally:
+            idle.set()
+            thread.join()
+
+    def test_read_ahead_waits_for_other_reader(self):
+        left, right = Flow(range(3000)).tee(2, buffer_size=4)
+        right_results = []
+
+        thread = threading.Thread(target=consume, args=(right, right_results))
+        thread.start()
+        left_results = [item for _, item in left]
+        thread.join()
+
+        assert left_results == list(range(3000))
+        assert right_results == list(range(3000))
+
+    def test_stopped_child_is_detached(self):
+        left, right = Flow(range(20)).tee(2, buffer_size=2)
+
+        next(left)
+        left.stop()
+
+        assert [item for _, item in right] == list(range(20))
+
+
+class TestBranch:
+    def test_routing(self):
+        branches = Flow(range(10)).branch(
+            {"even": lambda item: item % 2 == 0, "small": lambda item: item < 3},
+            buffer_size=16,
+        )
+
+        assert [item for _, item in branches["even"]] == [0, 2, 4, 6, 8]
+        assert [item for _, item in branches["small"]] == [0, 1, 2]
+
+    def test_child_skip_condition(self):
+        branches = Flow(range(6)).branch(
+            {"all": lambda item: True}, skip_condition=lambda item: item == 3
+        )
+
+        assert [index for index, _ in branches["all"]] == [0, 1, 2, 4, 5]
+
+    def test_source_skip_condition(self):
+        source = Flow(range(10), skip_condition=lambda item: item == 1)
+        (child,) = source.tee(1)
+
+        assert [item for _, item in child] == [0, 2, 3, 4, 5, 6, 7, 8, 9]
+
+    def test_source_error_is_raised(self):
+        def failing():
+            yield 1
+            raise RuntimeError("Source failed")
+
+        (child,) = Flow(failing()).tee(1)
+        assert next(child) == (0, 1)
+
+        with pytest.raises(RuntimeError):
+            next(child)
+
+    def test_invalid_buffer_size(self):
+        with pytest.raises(ValueError):
+            Router(Flow([1]), [None], 0)
@@ -0,0 +1,154 @@
+import json
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.checkpoint import Autosave, load_checkpoint
+
+
+class SeekableSource:
+    def __init__(self, length: int):
+        self.length = length
+        self.offset = 0
+
+    def seek(self, offset: int):
+        self.offset = offset
+
+    def __iter__(self):
+        return iter(range(self.offset, self.length))
+
+
+class TestCheckpoint:
+    def test_checkpoint_and_restore(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        flow = Flow(range(10))
+        next(flow)
+        next(flow)
+        flow.skip("Skipping the third item")
+        flow.checkpoint(path)
+
+        restored = Flow.restore(path, range(10))
+
+        assert restored._counter == 2
+        assert restored.skipped is True
+        assert restored._messages['skip'] == "Skipping the third item"
+        assert next(restored) == (3, 3)
+
+    def test_atomic_write(self, tmp_path):
+        path = tmp_path / "flow.json"
+        Flow([1, 2]).checkpoint(str(path))
+
+        # No temporary file is left behind
+        assert [file.name for file in tmp_path.iterdir()] == ["flow.json"]
+        assert json.loads(path.read_text())["counter"] == 0
+
+    def test_restore_generator(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        flow = Flow(i for i in range(5))
+        next(flow)
+        flow.checkpoint(path)
+
+        restored = Flow.restore(path, (i for i in range(5)))
+        assert list(restored) == [(1, 1), (2, 2), (3, 3), (4, 4)]
+
+    def test_restore_seek_hook(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        flow = Flow(SeekableSource(10))
+        flow.fast_forward(7)
+        flow.checkpoint(path)
+
+        source = SeekableSource(10)
+        restored = Flow.restore(path, source)
+
+        assert source.offset == 7
+        assert list(restored) == [(7, 7), (8, 8), (9, 9)]
+
+    def test_restore_seek_hook_with_replay(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+        Flow(SeekableSource(12)).checkpoint(path)
+        state = load_checkpoint(path)
+        state["counter"] = 7
+        with open(path, 'w') as file:
+            json.dump(state, file)
+
+        restored = Flow.restore(path, SeekableSource(12), replay=4)
+        assert [next(restored), next(restored)] == [(7, 7), (8, 8)]
+
+        restored.seek(7)
+        assert next(restored) == (7, 7)
+        with pytest.raises(ValueError):
+            restored.seek(6)
+
+    def test_restore_seek_hook_with_prefetch(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+        flow = Flow(SeekableSource(10))
+        flow.fast_forward(7)
+        flow.checkpoint(path)
+
+        with Flow.restore(path, SeekableSource(10), prefetch=2) as restored:
+            assert restored.iterator is restored._prefetcher
+            assert list(restored) == [(7, 7), (8, 8), (9, 9)]
+
+    def test_restore_batch_skip(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        def odd_mask(chunk):
+            return [item % 2 == 1 for item in chunk]
+
+        flow = Flow(i for i in range(10))
+        flow.seek(5)
+        flow.checkpoint(path)
+
+        restored = Flow.restore(
+            path, (i for i in range(10)), batch_skip_condition=odd_mask
+        )
+        assert list(restored) == [(6, 6), (8, 8)]
+
+    def test_invalid_version(self, tmp_path):
+        path = tmp_path / "flow.json"
+        path.write_text(json.dumps({"version": 0}))
+
+        with pytest.raises(ValueError):
+            load_checkpoint(str(path))
+
+
+class TestAutosave:
+    def test_every_items(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        flow = Flow(range(10))
+        flow.autosave(path, every=4)
+
+        assert flow._fast is False
+
+        for index, item in flow:
+            if index == 5:
+                break
+
+        # Saved before reading item 4, covering the four processed items
+        assert load_checkpoint(path)["counter"] == 4
+
+    def test_interval(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        flow = Flow(range(10))
+        flow.autosave(path, interval=0)
+        next(flow)
+        next(flow)
+
+        assert load_checkpoint(path)["counter"] == 1
+
+    def test_save_on_exit(self, tmp_path):
+        path = str(tmp_path / "flow.json")
+
+        with Flow(range(10)) as flow:
+            flow.autosave(path, every=100)
+            next(flow)
+
+        assert load_checkpoint(path)["counter"] == 1
+
+    def test_invalid_settings(self, tmp_path):
+        with pytest.raises(ValueError):
+            Autosave(str(tmp_path / "flow.json"))
@@ -0,0 +1,78 @@
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.combinators import CombinedFlow
+
+
+class TestMerge:
+    def test_sorted_merge(self):
+        merged = Flow.merge([1, 4, 7], Flow([2, 5, 8]), (i for i in [3, 6, 9]))
+
+        assert [item for _, (_, _, item) in merged] == list(range(1, 10))
+
+    def test_keeps_source_indices(self):
+        merged = Flow.merge([1, 3], [2])
+
+        assert list(merged) == [(0, (0, 0, 1)), (1, (1, 0, 2)), (2, (0, 1, 3))]
+        assert merged.total == 3
+
+    def test_key_and_stability(self):
+        left = [("a", 1), ("c", 2)]
+        right = [("b", 1), ("d", 2)]
+        merged = Flow.merge(left, right, key=lambda pair: pair[1])
+
+        assert [item[0] for _, (_, _, item) in merged] == ["a", "b", "c", "d"]
+
+    def test_child_skip_condition(self):
+        merged = Flow.merge(
+            Flow([1, 2, 3], skip_condition=lambda item: item == 2), [0, 4]
+        )
+        assert [item for _, (_, _, item) in merged] == [0, 1, 3, 4]
+
+
+class TestInterleaveAndChain:
+    def test_interleave(self):
+        interleaved = Flow.interleave([1, 2, 3], ["a"], [10, 20])
+
+        assert [item for _, (_, _, item) in interleaved] == [1, "a", 10, 2, 20, 3]
+
+    def test_chain(self):
+        chained = Flow.chain([1, 2], (i for i in [3]))
+        assert chained.total is None
+
+        assert list(chained) == [(0, (0, 0, 1)), (1, (0, 1, 2)), (2, (1, 0, 3))]
+        assert chained.total == 3
+
+
+class TestForwarding:
+    def test_stop_forwarded(self):
+        children = [Flow([1, 2]), Flow([3, 4])]
+        combined = Flow.chain(*children)
+        combined.stop()
+
+        assert all(child.stopped for child in children)
+        with pytest.raises(StopIteration):
+            next(combined)
+
+    def test_pause_and_resume_forwarded(self):
+        children = [Flow([1, 2]), Flow([3, 4])]
+        combined = Flow.interleave(*children)
+
+        combined.pause()
+        assert all(child.paused for child in children)
+
+        combined.resume()
+        assert not any(child.paused for child in children)
+        assert next(combined) == (0, (0, 0, 1))
+
+    def test_skip_drops_next_combined_item(self):
+        combined = Flow.interleave([1, 2], [3, 4])
+        combined.skip()
+
+        assert next(combined) == (1, (1, 0, 3))
+
+    def test_subclass_is_slotted(self):
+        combined = Flow.chain([1])
+
+        assert isinstance(combined, CombinedFlow)
+        assert not hasattr(combined, '__dict__')
@@ -0,0 +1,171 @@
+import threading
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.control import EventController, PauseController
+
+
+def call_later(delay: float, fn):
+    timer = threading.Timer(delay, fn)
+    timer.start()
+    return timer
+
+
+class TestEventController:
+    def test_resume_from_thread(self, iterable):
+        flow = Flow(iterable, controller=EventController())
+        next(flow)
+        flow.pause()
+
+        call_later(0.01, flow.resume)
+        assert next(flow) == (1, 2)
+
+    def test_skip_from_thread(self, iterable):
+        flow = Flow(iterable, controller=EventController())
+        next(flow)
+        flow.pause()
+
+        call_later(0.01, flow.skip)
+        assert next(flow) == (2, 3)
+        assert flow.paused is False
+
+    def test_stop_from_thread(self, iterable):
+        flow = Flow(iterable, controller=EventController())
+        flow.pause()
+
+        call_later(0.01, flow.stop)
+        with pytest.raises(StopIteration):
+            next(flow)
+
+    def test_timeout(self, iterable):
+        flow = Flow(
+            iterable, controller=EventController(timeout=0.01, on_timeout='resume')
+        )
+        flow.pause()
+
+        assert next(flow) == (0, 1)
+
+    def test_timeout_stop(self, iterable):
+        flow = Flow(iterable, controller=EventController(timeout=0.01))
+        flow.pause()
+
+        with pytest.raises(StopIteration):
+            next(flow)
+
+    def test_invalid_timeout_action(self):
+        with pytest.raises(ValueError):
+            EventController(on_timeout='pause')
+
+    def test_wait_resumed(self, iterable):
+        flow = Flow(iterable)
+        flow.pause()
+
+        assert flow.wait_resumed(timeout=0.01) is False
+
+        call_later(0.01, flow.resume)
+        assert flow.wait_resumed(timeout=1) is True
+
+
+class TestCustomController:
+    def test_custom_controller(self, iterable):
+        class SkipController(PauseController):
+            def handle(self, flow):
+                flow.skip()
+                flow.resume()
+
+        flow = Flow(iterable, controller=SkipController())
+        flow.pause()
+
+        assert next(flow) == (1, 2)
+
+
+class CountingController(PauseController):
+    def __init__(self):
+        self.pauses = []
+
+    def handle(self, flow):
+        self.pauses.append(flow._counter)
+        flow.resume()
+
+
+class TestConditionalPause:
+    def test_pause_condition(self, iterable):
+        controller = CountingController()
+        flow = Flow(
+            iterable, controller=controller, pause_condition=lambda item: item == 2
+        )
+
+        assert list(flow) == [(0, 1), (1, 2), (2, 3), (3, 4)]
+        assert controller.pauses == [2]
+
+    def test_fused_with_skip_condition(self, iterable):
+        calls = []
+
+        def skip_condition(item):
+            calls.append(item)
+            return item % 2 == 0
+
+        controller = CountingController()
+        flow = Flow(
+            iterable,
+            controller=controller,
+            skip_condition=skip_condition,
+            pause_condition=lambda item: item >= 3,
+        )
+
+        assert list(flow) == [(0, 1), (2, 3)]
+        assert calls == [1, 2, 3, 4]
+        assert controller.pauses == [3, 4]
+
+    def test_pause_every(self):
+        controller = CountingController()
+        flow = Flow(range(10), controller=controller, pause_every=3)
+
+        assert len(list(flow)) == 10
+        assert controller.pauses == [3, 6, 9]
+        assert flow._fast
+
+    def test_pause_every_after_seek(self):
+        controller = CountingController()
+        flow = Flow(range(10), controller=controller, pause_every=3)
+        flow.seek(7)
+
+        assert len(list(flow)) == 3
+        assert controller.pauses == [7, 9]
+
+    def test_pause_every_batches(self):
+        controller = CountingController()
+        flow = Flow(range(100), controller=controller, pause_every=10)
+
+        assert len(list(flow.batches(size=25))) == 4
+        assert controller.pauses == [25, 50, 75, 100]
+
+    def test_pause_condition_batches(self):
+        controller = CountingController()
+        flow = Flow(
+            range(100),
+            controller=controller,
+            skip_condition=lambda item: item % 2 == 1,
+            pause_condition=lambda item: item == 30,
+        )
+
+        batches = [batch for _, batch in flow.batches(size=25)]
+        assert batches[1] == list(range(26, 50, 2))
+        assert controller.pauses == [50]
+
+        with pytest.raises(ValueError):
+            flow.batches(kind='view')
+
+    def test_invalid_pause_every(self, iterable):
+        with pytest.raises(ValueError):
+            Flow(iterable, pause_every=0)
+
+    def test_pause_after(self):
+        flow = Flow(range(10), controller=EventController(), pause_after=0.01)
+        next(flow)
+        flow._pause_timer.join()
+
+        assert flow.paused
+        call_later(0.01, flow.resume)
+        assert next(flow) == (1, 1)
+        assert flow._fast
@@ -0,0 +1,127 @@
+import gc
+import threading
+import weakref
+
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.control import EventController
+from flowstep.events import EventBus
+
+
+class TestEventBus:
+    def test_sync_delivery(self):
+        bus, received = EventBus(), []
+        bus.subscribe('pause', lambda *event: received.append(event))
+
+        bus.emit('pause', 3, "message")
+        bus.emit('resume', 3)
+        assert received == [('pause', 3, "message")]
+
+    def test_unsubscribe(self):
+        bus, received = EventBus(), []
+        unsubscribe = bus.subscribe('item', lambda *event: received.append(event))
+        unsubscribe()
+
+        bus.emit('item', 0, 1)
+        assert received == []
+        assert not bus.has_subscribers('item')
+
+    def test_unknown_event(self):
+        with pytest.raises(ValueError):
+            EventBus().subscribe('unknown', print)
+
+    def test_async_delivery(self):
+        bus, received = EventBus(queue_size=100), []
+        caller = threading.get_ident()
+        bus.subscribe('item', lambda *event: received.append(threading.get_ident()))
+
+        for counter in range(10):
+            bus.emit('item', counter, counter)
+        bus.close()
+
+        assert len(received) == 10
+        assert caller not in received
+
+    def test_async_drops_when_full(self):
+        bus, released = EventBus(queue_size=2), threading.Event()
+        bus.subscribe('item', lambda *event: released.wait())
+
+        for counter in range(10):
+            bus.emit('item', counter)
+        assert bus.dropped >= 7
+
+        released.set()
+        bus.close()
+
+    def test_async_handler_errors_are_logged(self):
+        bus, received = EventBus(queue_size=10), []
+
+        def failing(*event):
+            raise RuntimeError("Handler failed")
+
+        bus.subscribe('item', failing)
+        bus.subscribe('item', lambda *event: received.append(event))
+        bus.emit('item', 0, 1)
+        bus.close()
+
+        assert received == [('item', 0, 1)]
+
+
+class TestFlowEvents:
+    def test_watchers_do_not_keep_flows_alive(self, iterable):
+        bus = EventBus()
+        flows = weakref.WeakSet(Flow(iterable, events=bus) for _ in range(1000))
+        gc.collect()
+
+        assert len(flows) == 0
+        assert bus._watchers == {}
+
+        flow = Flow(iterable, events=bus)
+        bus.subscribe('item', print)
+        assert flow._fast is False
+
+    def test_lifecycle_events(self, iterable):
+        flow, received = Flow(iterable, controller=EventController()), []
+        for event in ('pause', 'resume', 'skip', 'stop'):
+            flow.on(event, lambda *event: received.append(event))
+
+        flow.pause("Waiting")
+        flow.resume()
+        flow.skip()
+        flow.stop()
+
+        assert received == [
+            ('pause', 0, "Waiting"),
+            ('resume', 0, None),
+            ('skip', 0, None),
+            ('stop', 0, None),
+        ]
+
+    def test_item_events_toggle_fast_path(self, iterable):
+        flow, received = Flow(iterable, skip_condition=lambda item: item == 2), []
+        flow.on('item', lambda event, counter, item: received.append(item))
+        list(flow)
+        assert received == [1, 3, 4]
+
+        fast = Flow(iterable)
+        unsubscribe = fast.on('item', lambda *event: None)
+        assert not fast._fast
+
+        unsubscribe()
+        assert fast._fast
+
+    def test_lifecycle_subscribers_keep_fast_path(self, iterable):
+        flow = Flow(iterable)
+        flow.on('stop', lambda *event: None)
+
+        assert flow._fast
+
+    def test_shared_async_bus(self, iterable):
+        bus, received = EventBus(queue_size=16), []
+        bus.subscribe('item', lambda event, counter, item: received.append(item))
+
+        with Flow(iterable, events=bus) as flow:
+            assert list(flow) == [(0, 1), (1, 2), (2, 3), (3, 4)]
+
+        assert received == iterable
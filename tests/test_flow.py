@@ -1,3 +1,9 @@
+import os
+import subprocess
+import sys
+import weakref
+from pathlib import Path
+
 import pytest
 from unittest.mock import patch  # For mocking user input
 
@@ -335,3 +341,132 @@ class TestFlow:
 
         with pytest.raises(ValueError):
             flow._get_item_at_step(4)
+
+    def test_total_from_len(self, iterable):
+        flow = Flow(iterable)
+        assert flow.total == 4
+
+    def test_total_does_not_consume_generator(self):
+        generator = (i for i in range(3))
+        flow = Flow(generator)
+
+        # Unknown upfront, the generator is left untouched
+        assert flow.total is None
+        assert list(flow) == [(0, 0), (1, 1), (2, 2)]
+
+        # Settled once the iterable is exhausted
+        assert flow.total == 3
+
+    def test_get_item_at_step_unknown_total(self):
+        flow = Flow((i for i in range(3)), restart_on_get_item=False)
+
+        with pytest.raises(ValueError):
+            flow._get_item_at_step(5)
+
+        assert flow.total == 3
+
+    def test_long_skip_run(self):
+        # Deeper than the default recursion limit
+        length = 100_000
+        flow = Flow(range(length), skip_condition=lambda item: item < length - 1)
+
+        assert list(flow) == [(length - 1, length - 1)]
+
+    def test_get_item_at_step_random_access(self):
+        def fail(item):
+            raise AssertionError("Skip condition must not be re-evaluated")
+
+        flow = Flow(range(1_000_000), skip_condition=fail)
+
+        assert flow._get_item_at_step(999_999) == (999_999, 999_999)
+        assert flow._counter == 0
+
+    def test_get_item_at_step_no_restart(self, iterable):
+        flow = Flow(iterable, restart_on_get_item=False)
+
+        assert flow._get_item_at_step(2) == (2, 3)
+        assert next(flow) == (3, 4)
+
+    def test_get_item_at_step_iterator(self):
+        flow = Flow(iter(["apple", "banana", "cherry"]), restart_on_get_item=False)
+
+        assert flow._get_item_at_step(1) == (1, "banana")
+        assert next(flow) == (2, "cherry")
+
+    def test_fast_forward_random_access(self, iterable):
+        flow = Flow(iterable)
+        flow.fast_forward(2)
+
+        assert next(flow) == (2, 3)
+
+        flow.fast_forward(10)
+        with pytest.raises(StopIteration):
+            next(flow)
+
+    def test_seek(self, iterable):
+        flow = Flow(iterable)
+        flow.seek(3)
+        assert next(flow) == (3, 4)
+
+        # Random-access sources can seek backwards
+        flow.seek(0)
+        assert next(flow) == (0, 1)
+
+    def test_seek_iterator_backwards(self):
+        flow = Flow(iter([1, 2, 3]))
+        flow.seek(2)
+
+        with pytest.raises(ValueError):
+            flow.seek(1)
+
+        assert next(flow) == (2, 3)
+
+    def test_messages_formatted_lazily(self, iterable):
+        flow = Flow(iterable)
+        flow.pause()
+
+        # Stored unformatted until read
+        assert dict.__getitem__(flow._messages, 'pause') == ('Paused', 0)
+        assert flow._messages['pause'] == 'Paused at item count 1'
+
+    def test_slots(self, iterable):
+        flow = Flow(iterable)
+
+        assert not hasattr(flow, '__dict__')
+        with pytest.raises(AttributeError):
+            flow.undefined_attribute = True
+
+    def test_weak_references(self, iterable):
+        flow = Flow(iterable)
+        flows = weakref.WeakSet([flow])
+
+        assert weakref.ref(flow)() is flow
+        del flow
+        assert len(flows) == 0
+
+    def test_import_leaves_feature_modules_unloaded(self):
+        code = (
+            "import sys, flowstep; "
+            "loaded = {name for name in sys.modules if name.startswith('flowstep.')}; "
+            "assert loaded <= {'flowstep.asyncflow', 'flowstep.control', "
+            "'flowstep.defaults', 'flowstep.flow', 'flowstep.logging_', "
+            "'flowstep.utils'}, loaded"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1])}
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    def test_fast_path(self, iterable):
+        assert Flow(iterable)._fast is True
+        assert Flow(iterable, skip_condition=lambda item: False)._fast is False
+        assert Flow(iter(iterable), replay=2)._fast is False
+
+    def test_fast_path_yields_to_actions(self, iterable):
+        flow = Flow(iterable)
+        assert next(flow) == (0, 1)
+
+        flow.skip()
+        assert next(flow) == (2, 3)
+
+        flow.stop()
+        with pytest.raises(StopIteration):
+            next(flow)
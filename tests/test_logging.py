@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from flowstep.logging_ import configure_logging, logger as flowstep_logger
+
+
+class TestLogging:
+    def test_import_has_no_side_effects(self, tmp_path):
+        code = (
+            "import flowstep; from loguru import logger; "
+            "assert len(logger._core.handlers) == 1"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1])}
+        subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_library_messages_disabled_on_import(self, tmp_path):
+        code = (
+            "import flowstep; from flowstep.flow import Flow; "
+            "Flow(range(3), verbose=True).stop()"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[1])}
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.stderr == ""
+
+    def test_configure_logging_keeps_application_extra(self, tmp_path):
+        logger.configure(extra={"app": "demo"})
+        handlers = configure_logging()
+
+        try:
+            records = []
+            sink = logger.add(records.append, format="{extra}")
+            flowstep_logger.warning("From flowstep")
+            logger.remove(sink)
+        finally:
+            for handler in handlers:
+                logger.remove(handler)
+            logger.configure(extra={})
+            logger.disable("flowstep")
+
+        assert records[0].record["extra"]["app"] == "demo"
+        assert "user" in records[0].record["extra"]
+
+    def test_configure_logging(self, tmp_path):
+        log_file = tmp_path / "flow.log"
+        handlers = configure_logging(log_file=str(log_file))
+
+        try:
+            assert len(handlers) == 3
+            logger.debug("Hello")
+        finally:
+            for handler in handlers:
+                logger.remove(handler)
+            logger.disable("flowstep")
+
+        assert "Hello" in log_file.read_text()
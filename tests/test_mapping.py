@@ -0,0 +1,75 @@
+import time
+import pytest
+from unittest.mock import patch
+
+from flowstep.flow import Flow
+
+
+def square(item):
+    return item * item
+
+
+class TestFlowMap:
+    def test_thread_ordered(self):
+        flow = Flow(range(20))
+        assert list(flow.map(square, workers=4)) == [(i, i * i) for i in range(20)]
+
+    def test_process_ordered(self):
+        flow = Flow(range(10))
+        results = list(flow.map(square, workers=2, executor='process'))
+
+        assert results == [(i, i * i) for i in range(10)]
+
+    def test_unordered(self):
+        def slow_first(item):
+            if item == 0:
+                time.sleep(0.05)
+            return item
+
+        flow = Flow(range(4))
+        results = list(flow.map(slow_first, workers=4, ordered=False))
+
+        assert sorted(results) == [(i, i) for i in range(4)]
+        assert results[-1] == (0, 0)
+
+    def test_skip_condition_keeps_indices(self):
+        flow = Flow(range(6), skip_condition=lambda item: item % 2 == 0)
+        assert list(flow.map(square)) == [(1, 1), (3, 9), (5, 25)]
+
+    def test_stop_cancels_pending(self):
+        calls = []
+
+        def record(item):
+            calls.append(item)
+            return item
+
+        flow = Flow(range(1000))
+        results = []
+        for index, result in flow.map(record, workers=1, max_pending=2):
+            results.append(result)
+            if index == 2:
+                flow.stop()
+
+        assert results == [0, 1, 2]
+        assert len(calls) < 10
+
+    @patch('flowstep.flow.Flow._get_user_input')
+    def test_pause_stops_submissions(self, mocker):
+        mocker.return_value = "c"
+
+        flow = Flow(range(10))
+        mapped = flow.map(square, workers=2, max_pending=2)
+
+        assert next(mapped) == (0, 0)
+
+        # Pausing lets in-flight results drain, then waits on the flow
+        flow.pause()
+        assert next(mapped) == (1, 1)
+
+        assert mocker.call_count == 0
+        assert next(mapped) == (2, 4)
+        assert mocker.call_count == 1
+
+    def test_invalid_executor(self):
+        with pytest.raises(ValueError):
+            list(Flow([1]).map(square, executor='fiber'))
@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.control import EventController
+from flowstep.metrics import FlowMetrics, LogHistogram, PrometheusExporter
+
+
+class TestLogHistogram:
+    def test_percentiles(self):
+        histogram = LogHistogram()
+        for value in range(1, 1001):
+            histogram.record(value / 1e6)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(50) == pytest.approx(500e-6, rel=0.07)
+        assert histogram.percentile(99) == pytest.approx(990e-6, rel=0.07)
+        assert histogram.percentile(100) == pytest.approx(1000e-6)
+
+    def test_small_values_are_exact(self):
+        histogram = LogHistogram()
+        histogram.record(3e-9)
+
+        assert histogram.percentile(50) == pytest.approx(3e-9)
+
+    def test_merge(self):
+        first, second = LogHistogram(), LogHistogram()
+        first.record(1e-3)
+        second.record(2e-3)
+        first.merge(second)
+
+        assert first.count == 2
+        assert first.max == 2_000_000
+        assert first.min == 1_000_000
+
+    def test_merge_precision_mismatch(self):
+        with pytest.raises(ValueError):
+            LogHistogram(4).merge(LogHistogram(5))
+
+
+class TestFlowMetrics:
+    def test_counters(self):
+        metrics = FlowMetrics()
+        flow = Flow(
+            range(100), skip_condition=lambda item: item % 4 != 0, metrics=metrics
+        )
+
+        assert flow._fast is False
+        for index, item in flow:
+            time.sleep(0.001)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["items"] == 25
+        assert snapshot["skipped"] == 75
+        assert snapshot["skip_ratio"] == 0.75
+        assert snapshot["items_per_second"] > 0
+        assert snapshot["skip_condition_seconds"] > 0
+
+        latency = snapshot["consumer_latency_seconds"]
+        # The work on the last item is measured by the exhausting call
+        assert latency["count"] == 25
+        assert latency["p50"] >= 0.0009
+
+    def test_paused_time(self, iterable):
+        metrics = FlowMetrics()
+        flow = Flow(iterable, controller=EventController(), metrics=metrics)
+        flow.pause()
+
+        threading.Timer(0.02, flow.resume).start()
+        next(flow)
+
+        assert metrics.snapshot()["paused_seconds"] >= 0.015
+
+
+class TestPrometheusExporter:
+    def test_export(self, tmp_path):
+        path = tmp_path / "flow.prom"
+        metrics = FlowMetrics(
+            exporters=[PrometheusExporter(str(path), labels={"job": "etl"})]
+        )
+
+        list(Flow(range(10), metrics=metrics))
+        metrics.export()
+
+        text = path.read_text()
+        assert '# TYPE flowstep_items_total counter' in text
+        assert 'flowstep_items_total{job="etl"} 10' in text
+        assert 'flowstep_consumer_latency_seconds{job="etl",quantile="0.5"}' in text
+        assert 'flowstep_consumer_latency_seconds_count{job="etl"} 10' in text
@@ -0,0 +1,114 @@
+import threading
+import time
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.prefetch import Prefetcher
+
+
+def slow_source(length: int, delay: float = 0.0, reads: list = None):
+    for item in range(length):
+        time.sleep(delay)
+        if reads is not None:
+            reads.append(item)
+        yield item
+
+
+class TestPrefetcher:
+    def test_items_in_order(self):
+        assert list(Prefetcher(slow_source(50), 4)) == list(range(50))
+
+    def test_backpressure(self):
+        reads = []
+        prefetcher = Prefetcher(slow_source(100, reads=reads), 3)
+
+        assert next(prefetcher) == 0
+        time.sleep(0.05)
+
+        # One item handed out, three queued and one blocked on the full queue
+        assert len(reads) <= 5
+        prefetcher.close()
+
+    def test_source_error(self):
+        def failing():
+            yield 1
+            raise RuntimeError("Source failed")
+
+        prefetcher = Prefetcher(failing(), 2)
+        assert next(prefetcher) == 1
+
+        with pytest.raises(RuntimeError):
+            next(prefetcher)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            Prefetcher(iter([]), 0)
+
+
+class TestFlowPrefetch:
+    def test_overlaps_reads(self):
+        flow = Flow(slow_source(10, delay=0.01), prefetch=4)
+
+        began = time.perf_counter()
+        for index, item in flow:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - began
+
+        # Serial reads and work would take about 0.2 seconds
+        assert elapsed < 0.17
+        assert flow.total == 10
+
+    def test_pause_stops_producer(self):
+        reads = []
+        flow = Flow(slow_source(100, reads=reads), prefetch=2)
+        next(flow)
+
+        flow.pause()
+        time.sleep(0.02)
+        read_while_paused = len(reads)
+        time.sleep(0.05)
+
+        assert len(reads) == read_while_paused
+
+        flow.resume()
+        assert next(flow) == (1, 1)
+        flow.stop()
+
+    def test_stop_drains(self):
+        reads = []
+        flow = Flow(slow_source(1000, reads=reads), prefetch=8)
+        next(flow)
+
+        flow.stop()
+        with pytest.raises(StopIteration):
+            next(flow)
+
+        flow._prefetcher.close()
+        read_after_stop = len(reads)
+        time.sleep(0.02)
+
+        assert len(reads) == read_after_stop < 1000
+
+    def test_stop_wakes_blocked_consumer(self):
+        flow = Flow(slow_source(10, delay=0.3), prefetch=2)
+        next(flow)
+        outcome = []
+
+        def consume():
+            try:
+                next(flow)
+            except StopIteration:
+                outcome.append("stopped")
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        time.sleep(0.05)
+
+        flow.stop()
+        consumer.join(timeout=1)
+
+        assert not consumer.is_alive()
+        assert outcome == ["stopped"]
+
+    def test_random_access_sources_are_not_prefetched(self, iterable):
+        assert Flow(iterable, prefetch=4)._prefetcher is None
@@ -0,0 +1,91 @@
+import io
+import time
+
+from flowstep.flow import Flow
+from flowstep.progress import Progress, format_duration, render_progress
+
+
+class TestProgress:
+    def test_remaining(self, iterable):
+        flow = Flow(iterable)
+        next(flow)
+
+        assert flow.remaining == 3
+        assert Flow(i for i in range(3)).remaining is None
+
+    def test_rate_and_eta(self):
+        snapshots = []
+        flow = Flow(range(100))
+        progress = flow.progress(interval=0, render=snapshots.append)
+
+        time.sleep(0.01)
+        flow.fast_forward(50)
+        snapshot = progress.update()
+
+        assert snapshot["remaining"] == 50
+        assert snapshot["rate"] > 0
+        assert snapshot["eta"] > 0
+        assert snapshots == [snapshot]
+
+    def test_unknown_total_is_rate_only(self):
+        flow = Flow(i for i in range(10))
+        progress = Progress(flow, interval=0, render=None)
+
+        next(flow)
+        snapshot = progress.update()
+
+        assert snapshot["total"] is None
+        assert snapshot["eta"] is None
+
+    def test_tick_is_throttled(self):
+        snapshots = []
+        progress = Progress(Flow(range(10)), interval=60, render=snapshots.append)
+
+        progress.tick()
+        assert snapshots == []
+
+    def test_background_ticker(self):
+        snapshots = []
+        flow = Flow(range(1000))
+
+        with flow.progress(interval=0.005, render=snapshots.append):
+            for index, item in flow:
+                if index % 100 == 0:
+                    time.sleep(0.005)
+
+        assert len(snapshots) > 1
+        assert snapshots[-1]["counter"] == 1000
+        assert snapshots[-1]["remaining"] == 0
+
+    def test_smoothing(self):
+        flow = Flow(range(100))
+        progress = Progress(flow, smoothing=0.5, render=None)
+        progress.rate = 10.0
+        progress._last_time -= 1.0
+
+        flow.fast_forward(30)
+        progress.update()
+
+        assert 19 < progress.rate < 21
+
+
+class TestRenderProgress:
+    def test_known_total(self):
+        stream = io.StringIO()
+        render_progress(
+            {"counter": 5, "total": 10, "remaining": 5, "rate": 2.5, "eta": 2.0}, stream
+        )
+
+        assert stream.getvalue() == "\r5/10 (50.0%) | 2.5 it/s | ETA 00:02"
+
+    def test_unknown_total(self):
+        stream = io.StringIO()
+        render_progress(
+            {"counter": 5, "total": None, "remaining": None, "rate": 2.5, "eta": None},
+            stream,
+        )
+
+        assert stream.getvalue() == "\r5 | 2.5 it/s"
+
+    def test_format_duration(self):
+        assert format_duration(3725) == "1:02:05"
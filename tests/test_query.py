@@ -0,0 +1,142 @@
+import sqlite3
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.sources import ConnectionPool, QuerySource
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "rows.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY, value TEXT)")
+        connection.executemany(
+            "INSERT INTO rows VALUES (?, ?)", [(i, f"v{i}") for i in range(100)]
+        )
+    connection.close()
+    return path
+
+
+@pytest.fixture
+def statements():
+    return []
+
+
+@pytest.fixture
+def connect(database, statements):
+    def connect():
+        # Prefetching flows read from a background thread
+        connection = sqlite3.connect(database, check_same_thread=False)
+        connection.set_trace_callback(statements.append)
+        return connection
+
+    return connect
+
+
+class TestConnectionPool:
+    def test_reuses_connections(self, connect):
+        pool = ConnectionPool(connect, size=2)
+
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+
+        second = pool.acquire()
+        assert second is not first
+        pool.close()
+
+    def test_invalid_size(self, connect):
+        with pytest.raises(ValueError):
+            ConnectionPool(connect, size=0)
+
+
+class TestQuerySource:
+    def test_streams_rows(self, connect):
+        source = QuerySource(
+            connect, "SELECT id FROM rows WHERE id < ?", (10,), batch_size=3
+        )
+
+        assert [row[0] for row in source] == list(range(10))
+        assert source.pool._idle.qsize() == 1
+        source.close()
+
+    def test_seek_without_key(self, connect):
+        source = QuerySource(connect, "SELECT id FROM rows ORDER BY id", batch_size=7)
+        source.seek(20)
+
+        assert next(source) == (20,)
+        source.close()
+
+    def test_seek_by_key_resumes_after_boundary(self, connect, statements):
+        source = QuerySource(
+            connect, "SELECT id, value FROM rows", batch_size=10, key='id'
+        )
+        rows = [next(source) for _ in range(45)]
+        assert rows[-1] == (44, "v44")
+
+        del statements[:]
+        source.seek(35)
+
+        assert next(source) == (35, "v35")
+        # Resumes after the key ending the third batch, earlier rows are not read
+        assert any("WHERE id > 29" in statement for statement in statements)
+        source.close()
+
+    def test_keyset_requires_positional_params(self, connect):
+        with pytest.raises(ValueError):
+            QuerySource(connect, "SELECT * FROM rows", {"id": 1}, key='id')
+
+
+class TestFlowFromQuery:
+    def test_iterates_rows(self, connect):
+        with Flow.from_query(connect, "SELECT id FROM rows", batch_size=16) as flow:
+            assert [index for index, _ in flow] == list(range(100))
+            assert flow.total == 100
+
+    def test_seek_backwards(self, connect):
+        flow = Flow.from_query(connect, "SELECT id FROM rows", batch_size=16, key='id')
+        for _ in range(50):
+            next(flow)
+
+        flow.seek(10)
+        assert next(flow) == (10, (10,))
+
+    def test_restore(self, connect, statements, tmp_path):
+        path = str(tmp_path / "flow.json")
+        flow = Flow.from_query(connect, "SELECT id FROM rows", batch_size=10, key='id')
+        for _ in range(30):
+            next(flow)
+        flow.checkpoint(path)
+
+        del statements[:]
+        restored = Flow.restore(
+            path, QuerySource(connect, "SELECT id FROM rows", batch_size=10, key='id')
+        )
+        assert next(restored) == (30, (30,))
+        # Resumes after the key ending the third batch, earlier rows are not read
+        assert [statement for statement in statements if "SELECT" in statement] == [
+            "SELECT * FROM (SELECT id FROM rows) AS page WHERE id > 29 ORDER BY id"
+        ]
+
+    def test_restore_with_prefetch(self, connect, statements, tmp_path):
+        path = str(tmp_path / "flow.json")
+        with Flow.from_query(
+            connect, "SELECT id FROM rows", batch_size=10, key='id', prefetch=4
+        ) as flow:
+            for _ in range(30):
+                next(flow)
+            flow.checkpoint(path)
+
+        del statements[:]
+        restored = Flow.restore(
+            path, QuerySource(connect, "SELECT id FROM rows", batch_size=10, key='id')
+        )
+        assert next(restored) == (30, (30,))
+        assert any("WHERE id > 29" in statement for statement in statements)
+
+    def test_get_item_at_step_restarts(self, connect):
+        flow = Flow.from_query(connect, "SELECT id FROM rows", batch_size=8, key='id')
+        next(flow)
+
+        assert flow._get_item_at_step(40) == (40, (40,))
+        assert next(flow) == (1, (1,))
@@ -0,0 +1,122 @@
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.replay import ReplayBuffer
+
+
+def generator(length: int = 10):
+    return (i for i in range(length))
+
+
+class TestReplayBuffer:
+    def test_window_eviction(self):
+        buffer = ReplayBuffer(capacity=3)
+        for item in range(5):
+            buffer.record(item)
+
+        assert buffer.end == 5
+        assert 1 not in buffer
+        assert buffer.get(2) == 2
+        assert buffer.can_replay_from(2)
+        assert not buffer.can_replay_from(1)
+        assert buffer.can_replay_from(5)
+        assert not buffer.can_replay_from(6)
+        assert not buffer.can_replay_from(-1)
+
+        with pytest.raises(ValueError):
+            buffer.get(0)
+
+    def test_lru_eviction(self):
+        buffer = ReplayBuffer(capacity=2, policy='lru')
+        buffer.record('a')
+        buffer.record('b')
+
+        # Reading 'a' makes 'b' the least recently used
+        buffer.get(0)
+        buffer.record('c')
+
+        assert 0 in buffer
+        assert 1 not in buffer
+
+    def test_spill(self):
+        with ReplayBuffer(capacity=2, spill=True, checkpoint_interval=3) as buffer:
+            for item in range(10):
+                buffer.record({'value': item})
+
+            assert buffer.can_replay_from(0)
+            assert [buffer.get(index)['value'] for index in range(10)] == list(
+                range(10)
+            )
+
+            # Writing continues after reading from the spill file
+            buffer.record({'value': 10})
+            assert buffer.get(10) == {'value': 10}
+            assert buffer.get(1) == {'value': 1}
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            ReplayBuffer(policy='fifo')
+
+
+class TestFlowReplay:
+    def test_restart_on_get_item(self):
+        flow = Flow(generator(), replay=16)
+        next(flow)
+
+        assert flow._get_item_at_step(5) == (5, 5)
+
+        # The flow restarts where it was without re-running the generator
+        assert next(flow) == (1, 1)
+        assert [index for index, item in flow] == list(range(2, 10))
+
+    def test_restart_without_replay(self):
+        flow = Flow(generator(), restart_on_get_item=True)
+
+        with pytest.raises(ValueError):
+            flow._get_item_at_step(5)
+
+        # Nothing is read before refusing
+        assert next(flow) == (0, 0)
+
+    def test_restart_beyond_replay_capacity(self):
+        flow = Flow(generator(), replay=ReplayBuffer(capacity=2))
+
+        with pytest.raises(ValueError):
+            flow._get_item_at_step(5)
+
+    def test_seek_backwards(self):
+        flow = Flow(generator(), replay=ReplayBuffer(capacity=4))
+        flow.seek(8)
+
+        flow.seek(6)
+        assert next(flow) == (6, 6)
+
+        with pytest.raises(ValueError):
+            flow.seek(2)
+
+    def test_seek_forward_after_replay(self):
+        flow = Flow(generator(), replay=4)
+        flow.seek(5)
+        flow.seek(3)
+        flow.seek(7)
+
+        assert next(flow) == (7, 7)
+
+
+class TestReplayStart:
+    def test_start_at(self):
+        buffer = ReplayBuffer(capacity=2, spill=True, checkpoint_interval=4)
+        buffer.start_at(6)
+        for item in range(6, 12):
+            buffer.record(item)
+
+        assert buffer.can_replay_from(6)
+        assert not buffer.can_replay_from(5)
+        assert [buffer.get(index) for index in range(6, 12)] == list(range(6, 12))
+
+    def test_start_at_requires_empty_buffer(self):
+        buffer = ReplayBuffer()
+        buffer.record(1)
+
+        with pytest.raises(ValueError):
+            buffer.start_at(5)
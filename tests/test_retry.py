@@ -0,0 +1,111 @@
+import time
+import pytest
+from collections import Counter
+from unittest.mock import patch
+
+from flowstep.flow import Flow
+from flowstep.retry import backoff_delay
+
+
+class Flaky:
+    """Fails the first `failures` calls for each item."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = Counter()
+
+    def __call__(self, item):
+        self.calls[item] += 1
+        if self.calls[item] <= self.failures:
+            raise RuntimeError(f"Item {item} failed")
+        return item * 10
+
+
+class TestFlowRun:
+    def test_success(self, iterable):
+        assert Flow(iterable).run(lambda item: item * 10) == [
+            (0, 10),
+            (1, 20),
+            (2, 30),
+            (3, 40),
+        ]
+
+    def test_retries(self, iterable):
+        fn = Flaky(failures=2)
+        flow = Flow(iterable)
+
+        results = flow.run(fn, retries=2, backoff=0.001)
+
+        assert sorted(results) == [(0, 10), (1, 20), (2, 30), (3, 40)]
+        assert all(calls == 3 for calls in fn.calls.values())
+        assert flow.dead_letters == []
+
+    def test_backing_off_items_do_not_block(self):
+        def fail_first(item):
+            if item == 0:
+                raise RuntimeError("First item failed")
+            return item
+
+        flow = Flow(range(5))
+        results = flow.run(fail_first, retries=1, backoff=0.05, jitter=0)
+
+        # Healthy items completed while the first one was backing off
+        assert results == [(1, 1), (2, 2), (3, 3), (4, 4)]
+        assert [letter.index for letter in flow.dead_letters] == [0]
+        assert flow.dead_letters[0].attempts == 2
+
+    def test_give_up_stop(self):
+        flow = Flow(range(10))
+        results = flow.run(Flaky(failures=5), retries=0, on_give_up='stop')
+
+        assert results == []
+        assert flow.stopped is True
+        assert len(flow.dead_letters) == 1
+
+    @patch('flowstep.flow.Flow._get_user_input')
+    def test_give_up_pause(self, mocker):
+        mocker.return_value = "c"
+
+        flow = Flow(range(3))
+        results = flow.run(Flaky(failures=5), retries=0, on_give_up='pause')
+
+        assert results == []
+        assert len(flow.dead_letters) == 3
+        assert mocker.call_count == 3
+
+    def test_workers(self):
+        def slow(item):
+            time.sleep(0.02)
+            return item
+
+        began = time.perf_counter()
+        results = Flow(range(8)).run(slow, workers=4)
+
+        assert sorted(results) == [(i, i) for i in range(8)]
+        assert time.perf_counter() - began < 0.12
+
+    def test_not_retried_errors_are_raised(self, iterable):
+        def fail(item):
+            raise KeyError(item)
+
+        with pytest.raises(KeyError):
+            Flow(iterable).run(fail, retry_on=(RuntimeError,))
+
+    def test_invalid_give_up_action(self, iterable):
+        with pytest.raises(ValueError):
+            Flow(iterable).run(lambda item: item, on_give_up='retry')
+
+
+class TestBackoffDelay:
+    def test_exponential(self):
+        assert [backoff_delay(attempt, 1.0, 0, 60) for attempt in (1, 2, 3)] == [
+            1,
+            2,
+            4,
+        ]
+
+    def test_capped(self):
+        assert backoff_delay(10, 1.0, 0, 5.0) == 5.0
+
+    def test_jitter(self):
+        assert 1.0 <= backoff_delay(1, 1.0, 0.5, 60) <= 1.5
@@ -0,0 +1,120 @@
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.replay import ReplayBuffer
+from flowstep.search import SearchIndex
+
+
+class TestSearchIndex:
+    def test_hash_index(self):
+        index = SearchIndex(key=len)
+        index.record(3, "abc")
+        index.record(1, "xyz")
+
+        assert index.find(3) == 1
+        assert index.find(2) is None
+
+    def test_sorted_index_ignores_replayed_items(self):
+        index = SearchIndex(sorted=True)
+        for step, item in [(0, 1), (1, 3), (1, 3), (2, 5)]:
+            index.record(step, item)
+
+        assert index.find(3) == 1
+        assert index.find(4) is None
+
+    def test_sorted_view(self):
+        index = SearchIndex(sorted=True, view=[1, 3, 3, 7])
+
+        assert index.find(3) == 1
+        assert index.find(8) is None
+
+
+class TestFlowSearch:
+    def test_find_on_random_access_source(self):
+        flow = Flow(["b", "a", "c", "a"])
+        flow.index_by()
+
+        assert flow.find("a") == 1
+        assert flow.find("z") is None
+        assert flow._fast
+
+    def test_find_sorted_source(self):
+        records = [{"id": i * 2} for i in range(1000)]
+        flow = Flow(records)
+        flow.index_by(key=lambda record: record["id"], sorted=True)
+
+        flow.seek(flow.find(500))
+        assert next(flow) == (250, {"id": 500})
+
+    def test_find_on_sequential_source(self):
+        flow = Flow((item for item in "abcab"), skip_condition=lambda item: item == "b")
+        flow.index_by()
+
+        assert flow.find("a") is None
+        list(flow)
+
+        assert flow.find("a") == 0
+        assert flow.find("c") == 2
+        assert flow.find("b") is None
+
+    def test_find_on_random_access_source_with_skip_condition(self):
+        flow = Flow(list("abcab"), skip_condition=lambda item: item == "b")
+        flow.index_by()
+
+        assert flow.find("a") == 0
+        assert flow.find("c") == 2
+        assert flow.find("b") is None
+
+    def test_find_sorted_source_with_skip_condition(self):
+        records = [(i // 2, i) for i in range(100)]
+        flow = Flow(records, skip_condition=lambda record: record[1] % 4 == 0)
+        flow.index_by(key=lambda record: record[0], sorted=True)
+
+        # The first record with key 10 is skipped, the second one is found
+        assert flow.find(10) == 21
+        assert flow.find(11) == 22
+
+    def test_find_and_seek_with_replay(self):
+        flow = Flow(iter("abcd"), replay=ReplayBuffer(capacity=10))
+        flow.index_by()
+        list(flow)
+
+        flow.seek(flow.find("c"))
+        assert next(flow) == (2, "c")
+
+    def test_find_requires_index(self, iterable):
+        with pytest.raises(ValueError):
+            Flow(iterable).find(1)
+
+
+class TestBookmarks:
+    def test_goto(self, iterable):
+        flow = Flow(iterable)
+        next(flow)
+        flow.bookmark("second")
+        list(flow)
+
+        flow.goto("second")
+        assert next(flow) == (1, 2)
+        assert flow.bookmarks == {"second": 1}
+
+    def test_explicit_step(self, iterable):
+        flow = Flow(iterable)
+        flow.bookmark("last", 3)
+
+        flow.goto("last")
+        assert next(flow) == (3, 4)
+
+    def test_unknown_bookmark(self, iterable):
+        with pytest.raises(KeyError):
+            Flow(iterable).goto("missing")
+
+    def test_bookmarks_checkpointed(self, iterable, tmp_path):
+        path = str(tmp_path / "flow.json")
+        flow = Flow(iterable)
+        flow.bookmark("start", 2)
+        flow.checkpoint(path)
+
+        restored = Flow.restore(path, iterable)
+        restored.goto("start")
+        assert next(restored) == (2, 3)
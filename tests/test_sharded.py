@@ -0,0 +1,113 @@
+import pytest
+
+from flowstep.sharded import ShardedFlow
+
+
+def square(item):
+    return item * item
+
+
+def is_odd(item):
+    return item % 2 == 1
+
+
+def negate(item):
+    return -item
+
+
+def identity(item):
+    return item
+
+
+def nest(item):
+    return [item]
+
+
+def field_sum(item):
+    return item['a'] + item['b']
+
+
+class TestShardedFlow:
+    def test_ordered(self):
+        sharded = ShardedFlow(list(range(100)), workers=2, shards=7)
+
+        assert list(sharded.map(square)) == [(i, i * i) for i in range(100)]
+        assert sharded.counter == 100
+
+    def test_as_completed(self):
+        sharded = ShardedFlow(range(50), workers=2)
+
+        assert sorted(sharded.map(square, ordered=False)) == [
+            (i, i * i) for i in range(50)
+        ]
+
+    def test_skip_condition_keeps_global_indices(self):
+        sharded = ShardedFlow(range(10), workers=2, shards=3, skip_condition=is_odd)
+
+        assert list(sharded.map(negate)) == [(i, -i) for i in range(0, 10, 2)]
+
+    def test_more_shards_than_items(self):
+        assert list(ShardedFlow([1, 2], workers=2, shards=8).map(negate)) == [
+            (0, -1),
+            (1, -2),
+        ]
+
+    def test_stop(self):
+        sharded = ShardedFlow(range(10_000), workers=2, shards=100)
+        results = []
+
+        for index, result in sharded.map(square):
+            results.append(result)
+            if index == 10:
+                sharded.stop()
+
+        assert sharded.stopped
+        assert len(results) < 10_000
+
+    def test_pause_flags(self):
+        sharded = ShardedFlow([1], workers=1)
+        sharded.pause()
+        assert sharded.paused
+
+        sharded.resume()
+        assert not sharded.paused
+
+    def test_numpy_shared_memory(self):
+        np = pytest.importorskip("numpy")
+
+        source = np.arange(1000, dtype=np.int64)
+        results = list(ShardedFlow(source, workers=2).map(square))
+
+        assert [index for index, _ in results] == list(range(1000))
+        assert [int(value) for _, value in results[:4]] == [0, 1, 4, 9]
+
+    def test_results_viewing_shared_rows(self):
+        np = pytest.importorskip("numpy")
+        source = np.arange(12).reshape(6, 2)
+
+        rows = list(ShardedFlow(source, workers=2).map(identity))
+        nested = list(ShardedFlow(source, workers=2).map(nest))
+
+        assert [row.tolist() for _, row in rows] == source.tolist()
+        assert [value[0].tolist() for _, value in nested] == source.tolist()
+
+    def test_structured_arrays_keep_their_fields(self):
+        np = pytest.importorskip("numpy")
+        source = np.array(
+            [(i, i / 2) for i in range(10)], dtype=[('a', 'i4'), ('b', 'f8')]
+        )
+
+        results = list(ShardedFlow(source, workers=2).map(field_sum))
+        assert [float(value) for _, value in results] == [i * 1.5 for i in range(10)]
+
+    def test_object_arrays_are_pickled(self):
+        np = pytest.importorskip("numpy")
+        source = np.array([1, "a", None], dtype=object)
+        sharded = ShardedFlow(source, workers=2)
+
+        assert sharded._shared_memory() is None
+        assert list(sharded.map(identity)) == [(0, 1), (1, "a"), (2, None)]
+
+    def test_requires_sliceable_source(self):
+        with pytest.raises(ValueError):
+            ShardedFlow(i for i in range(3))
@@ -0,0 +1,112 @@
+import os
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.sources import MappedFile, index_path
+
+
+@pytest.fixture
+def lines_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"alpha\nbeta\r\n\ngamma")
+    return str(path)
+
+
+class TestMappedFile:
+    def test_lines(self, lines_file):
+        with MappedFile(lines_file) as source:
+            assert len(source) == 4
+            assert [bytes(record) for record in source] == [
+                b"alpha",
+                b"beta",
+                b"",
+                b"gamma",
+            ]
+            assert isinstance(source[0], memoryview)
+            assert bytes(source[-1]) == b"gamma"
+
+    def test_jsonl_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        path.write_bytes(b'{"a": 1}\n\n{"a": 2}\n')
+
+        with MappedFile(str(path), format='jsonl') as source:
+            assert [bytes(record) for record in source] == [b'{"a": 1}', b'{"a": 2}']
+
+    def test_fixed(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"aabbcc")
+
+        with MappedFile(str(path), format='fixed', record_size=2) as source:
+            assert [bytes(record) for record in source[1:]] == [b"bb", b"cc"]
+            assert not os.path.exists(index_path(str(path), 'fixed'))
+
+    def test_fixed_size_mismatch(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"aab")
+
+        with pytest.raises(ValueError):
+            MappedFile(str(path), format='fixed', record_size=2)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+
+        assert len(MappedFile(str(path))) == 0
+
+    def test_index_cache(self, lines_file, monkeypatch):
+        MappedFile(lines_file).close()
+        assert os.path.exists(index_path(lines_file, 'lines'))
+
+        # A valid cache is read instead of scanning the file again
+        def fail(*args, **kwargs):
+            raise AssertionError("File scanned again")
+
+        monkeypatch.setattr("flowstep.sources.scan_lines", fail)
+        assert len(MappedFile(lines_file)) == 4
+
+    def test_unwritable_index_cache(self, lines_file, monkeypatch):
+        def read_only(*args, **kwargs):
+            raise PermissionError("Read-only file system")
+
+        monkeypatch.setattr("flowstep.sources.atomic_write", read_only)
+
+        with Flow.from_file(lines_file) as flow:
+            assert flow.total == 4
+        assert not os.path.exists(index_path(lines_file, 'lines'))
+
+    def test_stale_index_cache(self, lines_file):
+        MappedFile(lines_file).close()
+
+        with open(lines_file, 'ab') as file:
+            file.write(b"\ndelta")
+        stat = os.stat(lines_file)
+        os.utime(lines_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert bytes(MappedFile(lines_file)[-1]) == b"delta"
+
+    def test_index_out_of_range(self, lines_file):
+        with pytest.raises(IndexError):
+            MappedFile(lines_file)[4]
+
+    def test_invalid_format(self, lines_file):
+        with pytest.raises(ValueError):
+            MappedFile(lines_file, format='csv')
+
+
+class TestFlowFromFile:
+    def test_random_access(self, lines_file):
+        with Flow.from_file(lines_file, cache=False) as flow:
+            assert flow._view is not None
+            assert flow.total == 4
+            assert not os.path.exists(index_path(lines_file, 'lines'))
+
+            flow.seek(3)
+            index, item = next(flow)
+            assert (index, bytes(item)) == (3, b"gamma")
+
+            assert bytes(flow._get_item_at_step(1)[1]) == b"beta"
+
+    def test_skip_condition(self, lines_file):
+        flow = Flow.from_file(lines_file, skip_condition=lambda record: not record)
+
+        assert [index for index, _ in flow] == [0, 1, 3]
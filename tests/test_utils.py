@@ -1,5 +1,14 @@
+from collections import deque
 from typing import Iterable
-from flowstep.utils import is_sliceable
+import pytest
+
+from flowstep.flow import Flow
+from flowstep.utils import (
+    is_sliceable,
+    length_hint,
+    positional_view,
+    sliceable_view,
+)
 
 
 class TestUtils:
@@ -50,3 +59,99 @@ class TestUtils:
                 return key
 
         assert is_sliceable(WithGetItem()) is True
+
+    def test_length_hint_sized(self):
+        """
+        Test the length of a sized iterable.
+        """
+        assert length_hint([1, 2, 3]) == 3
+
+    def test_length_hint_iterator(self):
+        """
+        Test the length hint of a list iterator.
+        """
+        assert length_hint(iter([1, 2, 3])) == 3
+
+    def test_length_hint_generator(self):
+        """
+        Test that a generator has no known length and is not consumed.
+        """
+        generator = (i for i in range(3))
+
+        assert length_hint(generator) is None
+        assert list(generator) == [0, 1, 2]
+
+    def test_positional_view_list(self):
+        """
+        Test that a list is its own positional view.
+        """
+        lst = [1, 2, 3]
+        assert positional_view(lst) is lst
+
+    def test_positional_view_mapping(self):
+        """
+        Test that a mapping has no positional view.
+        """
+        assert positional_view({0: 'a'}) is None
+
+    def test_positional_view_generator(self):
+        """
+        Test that a generator has no positional view.
+        """
+        assert positional_view(i for i in range(3)) is None
+
+    def test_positional_view_linear_indexing(self):
+        """
+        Test that sequences indexed in linear time, such as deques, are iterated.
+        """
+        items = deque(range(3))
+
+        assert positional_view(items) is None
+        assert list(Flow(items)) == [(0, 0), (1, 1), (2, 2)]
+
+    def test_positional_view_numpy(self):
+        """
+        Test that NumPy arrays are their own positional view.
+        """
+        np = pytest.importorskip("numpy")
+        values = np.arange(3)
+
+        assert positional_view(values) is values
+
+
+class TestPandasSources:
+    def test_sliceable_view_uses_iloc(self):
+        pd = pytest.importorskip("pandas")
+        series = pd.Series([10, 20, 30], index=[2, 1, 0])
+
+        assert positional_view(series) is None
+        view = sliceable_view(series)
+        assert len(view) == 3
+        assert view[0] == 10
+        assert list(view[1:]) == [20, 30]
+
+    def test_flow_over_series(self):
+        pd = pytest.importorskip("pandas")
+        series = pd.Series([10, 20, 30])
+
+        assert list(Flow(series)) == [(0, 10), (1, 20), (2, 30)]
+        assert list(Flow(series, skip_condition=lambda item: item == 20)) == [
+            (0, 10),
+            (2, 30),
+        ]
+
+    def test_flow_over_dataframe(self):
+        pd = pytest.importorskip("pandas")
+        frame = pd.DataFrame({"a": range(5), "b": range(5)})
+
+        # Iterated like `iter(frame)`, over the column labels
+        assert list(Flow(frame)) == [(0, "a"), (1, "b")]
+        with pytest.raises(ValueError):
+            Flow(frame).batches(size=2, kind='view')
+
+    def test_batch_skip_condition_over_series(self):
+        pd = pytest.importorskip("pandas")
+        series = pd.Series(range(10), index=range(10, 0, -1))
+
+        flow = Flow(series, batch_skip_condition=lambda chunk: chunk % 2 == 1)
+        assert [item for _, item in flow] == [0, 2, 4, 6, 8]